@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# Benchmarks for the performance-sensitive parts of the Event Management System.
+# Run with: python Benchmark.py
+
+import os  # Import os module to run the scheduler benchmark in a temporary directory
+import pickle  # Import the pickle module to measure unpickling cost
+import random  # Import random module to make event requests
+import tempfile  # Import tempfile module for the temporary data files of the scheduler benchmark
+import time  # Import time module to time the start of the GUI
+import timeit  # Import timeit module for timing
+import tkinter as tk  # Import tkinter to catch a missing display
+import tracemalloc  # Import tracemalloc module to measure memory per record
+
+#Import classes from other files
+from Employee import Employee
+from Event import Event, EventType
+from Client import Client
+from Guest import Guest, GuestTable
+from Persistence import PersistenceScheduler
+from Repository import Repository
+from Search import PrefixIndex, TextIndex
+from Storage import RecordStore
+from Supplier import Supplier
+from Venue import Venue
+
+
+# Build a dictionary of guests without going through storage
+def make_guests(count):
+    return {f"G{i}": Guest(f"G{i}", f"Guest {i}", f"Street {i}", f"050{i:07d}") for i in range(count)}
+
+
+# Validation of a guest list one ID at a time, as Event.__init__ used to do it
+def validate_guest_list_loop(guest_list, guests):
+    for guest_id in guest_list:
+        if not isinstance(guest_id, str):
+            raise ValueError("Each guest ID in the guest list must be a string")
+        if guest_id not in guests:
+            raise ValueError(f"Guest with ID {guest_id} does not exist")
+
+
+# Compare the old validation (unpickle every guest, then check one ID at a time)
+# with Guest.find_missing_guests on the already loaded guests
+def benchmark_guest_list_validation(sizes=(1000, 10000, 100000), repeat=5):
+    print("Guest list validation (best of {} runs, milliseconds)".format(repeat))
+    print(f"{'guests':>10} {'reload+loop':>12} {'loop':>10} {'bulk':>10}")
+    for size in sizes:
+        guests = make_guests(size)
+        guest_list = list(guests)
+        pickled_guests = pickle.dumps(guests)  # What load_guests used to read from disk every time
+        reload_loop = min(timeit.repeat(lambda: validate_guest_list_loop(guest_list, pickle.loads(pickled_guests)), number=1, repeat=repeat))
+        loop = min(timeit.repeat(lambda: validate_guest_list_loop(guest_list, guests), number=1, repeat=repeat))
+        bulk = min(timeit.repeat(lambda: Guest.find_missing_guests(guest_list, guests), number=1, repeat=repeat))
+        print(f"{size:>10} {reload_loop * 1000:>12.2f} {loop * 1000:>10.2f} {bulk * 1000:>10.2f}")
+
+
+# Plain class with a per-instance __dict__, as every model class was before __slots__
+class PlainRecord:
+    pass
+
+
+# Copy a record into a PlainRecord holding the same attribute values
+def plain_copy(record):
+    plain = PlainRecord()
+    plain.__dict__.update(record.__getstate__())
+    return plain
+
+
+# Copy a slotted record without running __init__ validation
+def copy_slotted(record):
+    clone = type(record).__new__(type(record))
+    clone.__setstate__(record.__getstate__())
+    return clone
+
+
+# Measure the memory allocated by make_records(), in bytes per record
+def bytes_per_record(make_records, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = make_records()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count, records
+
+
+# Compare the memory of each model with and without __slots__ (attribute values are shared, so only
+# the per-instance overhead is measured)
+def benchmark_record_memory(count=100000):
+    samples = {
+        "Guest": Guest("G1", "Guest", "Street 1", "0501234567"),
+        "Client": Client("C1", "Client", "Street 1", "0501234567", 10000),
+        "Supplier": Supplier("S1", "Supplier", "Street 1", "0501234567"),
+        "Venue": Venue("V1", "Venue", "Street 1", "0501234567", 10, 100),
+        "Employee": Employee("Employee", "E1", "Sales", "Salesperson", 6000.0, 30, "01/01/1994", "12345678"),
+    }
+    # Events are created without validation so the benchmark does not need stored venues, clients or suppliers
+    event = Event.__new__(Event)
+    event.__setstate__(dict(event_id="EV1", event_type=EventType.WEDDING.value, theme="Theme", date="01/01/2030",
+                            time="18:00", duration=4, venue_address="Street 1", client_id="C1", guest_list=["G1"],
+                            catering_company="S1", cleaning_company="S1", decorations_company="S1",
+                            entertainment_company="S1", furniture_supply_company="S1", invoice=1000))
+    samples["Event"] = event
+
+    print("Memory per record ({} records, bytes)".format(count))
+    print(f"{'model':>10} {'__dict__':>10} {'__slots__':>10}")
+    for name, sample in samples.items():
+        before, _ = bytes_per_record(lambda: [plain_copy(sample) for _ in range(count)], count)
+        after, _ = bytes_per_record(lambda: [copy_slotted(sample) for _ in range(count)], count)
+        print(f"{name:>10} {before:>10.1f} {after:>10.1f}")
+
+
+
+# Compare a dictionary of Guest objects with a GuestTable: memory, save (pickle) and load (unpickle) time
+def benchmark_guest_table(count=100000, repeat=3):
+    # Guests share a few hundred streets, like a real registry
+    make_dict = lambda: {f"G{i}": Guest(f"G{i}", f"Guest {i % 5000}", f"Street {i % 300}", f"050{i:07d}") for i in range(count)}
+    dict_bytes, guests = bytes_per_record(make_dict, count)
+    table_bytes, table = bytes_per_record(lambda: GuestTable.from_records(make_dict()), count)
+
+    print("Guest container ({} guests)".format(count))
+    print(f"{'container':>10} {'bytes/guest':>12} {'save ms':>10} {'load ms':>10} {'file MB':>10}")
+    for name, records, size in (("dict", guests, dict_bytes), ("GuestTable", table, table_bytes)):
+        data = pickle.dumps(records)
+        save = min(timeit.repeat(lambda: pickle.dumps(records), number=1, repeat=repeat))
+        load = min(timeit.repeat(lambda: pickle.loads(data), number=1, repeat=repeat))
+        print(f"{name:>10} {size:>12.1f} {save * 1000:>10.1f} {load * 1000:>10.1f} {len(data) / 1e6:>10.1f}")
+
+
+# Measure one search-as-you-type keystroke: the guests whose ID or name starts with a prefix
+def benchmark_prefix_search(count=1000000, repeat=5):
+    table = GuestTable([f"G{i}" for i in range(count)], [f"Guest {i % 50000}" for i in range(count)],
+                       [f"Street {i % 300}" for i in range(count)], [f"050{i:07d}" for i in range(count)])
+    index = PrefixIndex("name")
+    index.rebuild(table)
+    build = min(timeit.repeat(lambda: (index.rebuild(table), index.build()), number=1, repeat=1))
+
+    print("Prefix search ({} guests, milliseconds)".format(count))
+    print(f"{'prefix':>12} {'matches':>10} {'search':>10}")
+    print(f"{'(build)':>12} {'':>10} {build * 1000:>10.1f}")
+    for prefix in ("g12345", "guest 4999", "guest 4", "x"):
+        search = min(timeit.repeat(lambda: index.search(prefix), number=1, repeat=repeat))
+        print(f"{prefix:>12} {len(index.search(prefix)):>10} {search * 1000:>10.2f}")
+
+
+# Measure a global search query on the inverted index of the guests
+def benchmark_text_search(count=100000, repeat=5):
+    table = GuestTable([f"G{i}" for i in range(count)], [f"Guest {i % 5000}" for i in range(count)],
+                       [f"{i % 300} Corniche Street" for i in range(count)], [f"050 {i:07d}" for i in range(count)])
+    index = TextIndex(("name", "address", "contact_details"))
+    build = min(timeit.repeat(lambda: (index.rebuild(table), index.build()), number=1, repeat=1))
+
+    print("Text search ({} guests, milliseconds)".format(count))
+    print(f"{'query':>24} {'search':>10}")
+    print(f"{'(build)':>24} {build * 1000:>10.1f}")
+    for query in ("050 0012345", "guest 4999", "17 corniche street", "street"):
+        search = min(timeit.repeat(lambda: index.search(index.words(query)), number=1, repeat=repeat))
+        print(f"{query:>24} {search * 1000:>10.2f}")
+
+
+# Measure scheduling a batch of event requests (guest counts and one-week windows drawn at random) against
+# venues and suppliers stored in a temporary directory, so the real data files are left alone
+def benchmark_scheduler(count=1000, venues=200, suppliers=500):
+    from Scheduler import EventRequest, Scheduler  # Imported here as it loads every store
+
+    directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as data_directory:
+        os.chdir(data_directory)  # Data files are relative to the working directory
+        Repository.invalidate()
+        try:
+            Venue.save_venues({f"V{i}": Venue(f"V{i}", f"Venue {i}", f"{i} Corniche Street", "0501234567", 10 + i % 50, 60 + i % 20 * 25)
+                               for i in range(venues)})
+            Supplier.save_suppliers({f"S{i}": Supplier(f"S{i}", f"Supplier {i}", f"{i} Market Street", "0501234567")
+                                     for i in range(suppliers)})
+            Client.save_clients({f"C{i}": Client(f"C{i}", f"Client {i}", f"{i} Palm Street", "0501234567", 100000) for i in range(100)})
+            Guest.save_guests(make_guests(10000))
+            generator = random.Random(1)
+            requests = []
+            for i in range(count):
+                day, guests, first_guest = generator.randint(1, 20), generator.randint(20, 500), generator.randint(0, 9000)
+                requests.append(EventRequest(f"R{i}", EventType.WEDDING.value, "Theme", f"C{i % 100}",
+                                             [f"G{j}" for j in range(first_guest, first_guest + guests)],
+                                             f"{day:02d}/06/2030", f"{day + 7:02d}/06/2030", "18:00", 4, 5000))
+
+            start = time.perf_counter()
+            result = Scheduler.schedule(requests)
+            schedule = time.perf_counter() - start
+        finally:
+            # Write the pending changes and let log compactions finish before the data directory is left, as
+            # both work with paths relative to it
+            PersistenceScheduler.flush()
+            RecordStore.wait_for_compactions()
+            Repository.invalidate()
+            os.chdir(directory)
+
+    print("Scheduler ({} requests, {} venues, {} suppliers)".format(count, venues, suppliers))
+    print(f"{'scheduled':>14} {len(result.scheduled):>10}")
+    print(f"{'seconds':>14} {schedule:>10.2f}")
+    print(f"{'capacity used':>14} {result.utilization():>10.0%}")
+
+
+# Measure how long the GUI takes until its window is drawn (only the first tab is built), and how long
+# building all the other tabs takes, which the GUI used to do before showing the window
+def benchmark_startup():
+    from GUI import EventManagementSystemGUI  # Imported here so the other benchmarks run without tkinter
+
+    print("GUI startup (milliseconds)")
+    try:
+        start = time.perf_counter()
+        app = EventManagementSystemGUI()
+        app.update()  # Draw the window
+    except tk.TclError as e:
+        print(f"Skipped: {e}")  # No display available
+        return
+    startup = time.perf_counter() - start
+    while app.loading:  # Let the background loading finish so the other tabs are built with their data
+        app.update()
+        time.sleep(0.01)
+    loaded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for title in app.tab_builders:
+        app.build_tab(title)
+    app.update()
+    other_tabs = time.perf_counter() - start
+    app.destroy()
+    print(f"{'window shown':>14} {startup * 1000:>10.1f}")
+    print(f"{'data loaded':>14} {loaded * 1000:>10.1f}")
+    print(f"{'other tabs':>14} {other_tabs * 1000:>10.1f}")
+    print(f"{'eager startup':>14} {(startup + other_tabs) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    benchmark_guest_list_validation()
+    benchmark_record_memory()
+    benchmark_guest_table()
+    benchmark_prefix_search()
+    benchmark_text_search()
+    benchmark_scheduler()
+    benchmark_startup()
+
+
+# In[ ]:
+
+
+
+
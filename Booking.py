@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import datetime  # Import datetime module to parse event dates and times
+from bisect import bisect_left, insort  # Import bisect functions to keep the bookings sorted by start
+
+from Repository import LazyIndex  # Import LazyIndex so the Repository keeps the index current
+
+EPOCH = datetime.datetime(1970, 1, 1)  # Start of epoch seconds (dates and times are taken as UTC)
+
+# Get the start of an event as epoch seconds from its "dd/mm/yyyy" date and "hh:mm" time.
+# Splitting the strings is several times faster than strptime when indexing many events;
+# datetime still rejects days, months, hours and minutes out of range.
+def parse_start(date, time):
+    try:
+        day, month, year = date.split("/")
+        hour, minute = time.split(":")
+        start = datetime.datetime(int(year), int(month), int(day), int(hour), int(minute))
+    except ValueError:
+        raise ValueError(f"Date and time should be dd/mm/yyyy and hh:mm, not {date} {time}")
+    return (start - EPOCH) // datetime.timedelta(seconds=1)
+
+
+# Get the (start, end) epoch seconds of an event from its date, time and duration in hours
+def event_interval(date, time, duration):
+    start = parse_start(date, time)
+    return start, start + int(duration) * 3600
+
+
+# Get the (start, end) epoch seconds of the whole day of a "dd/mm/yyyy" date
+def day_interval(date):
+    start = parse_start(date, "00:00")
+    return start, start + 24 * 3600
+
+
+# Get epoch seconds from epoch seconds, a datetime, a date (its midnight) or a "dd/mm/yyyy" or
+# "dd/mm/yyyy hh:mm" string, so calendar queries can be called from scripts as well as with form input
+def to_epoch(moment):
+    if isinstance(moment, (int, float)):
+        return int(moment)
+    if isinstance(moment, datetime.datetime):
+        return (moment.replace(tzinfo=None) - EPOCH) // datetime.timedelta(seconds=1)
+    if isinstance(moment, datetime.date):
+        return to_epoch(datetime.datetime.combine(moment, datetime.time()))
+    date, _, time = str(moment).strip().partition(" ")
+    return parse_start(date, time.strip() or "00:00")
+
+
+# Format epoch seconds as "dd/mm/yyyy hh:mm" for messages
+def format_time(seconds):
+    return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc).strftime("%d/%m/%Y %H:%M")
+
+
+# Define BookingIndex class: the time ranges events book a resource for (like a venue), per resource.
+# The bookings of a resource are kept sorted by start together with the longest booking, so the
+# bookings overlapping a time range are found with one binary search: only bookings starting less than
+# the longest booking before the range can reach into it. A query therefore also scans the bookings
+# starting within one longest booking before the range; the number of bookings of every length is
+# counted, so the longest booking shrinks again when a long event is removed.
+class BookingIndex(LazyIndex):
+    def __init__(self, resources):
+        super().__init__()
+        self.resources = resources  # Function returning the resources an event books
+        self.bookings = {}  # Resource -> (start, end, event ID) bookings sorted by start
+        self.max_span = {}  # Resource -> length of its longest booking
+        self.spans = {}  # Resource -> {booking length: number of bookings that long}
+
+    # Get the (start, end) of an event, or None if its date, time or duration are not valid
+    def interval(self, event):
+        start = getattr(event, "start", None)
+        if start is not None:
+            return start, event.end  # Worked out when the event was created or loaded
+        try:
+            return event_interval(event.date, event.time, event.duration)
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    # Empty the index
+    def clear(self):
+        self.bookings = {}
+        self.max_span = {}
+        self.spans = {}
+
+    # Count a booking of a resource with its length
+    def add_span(self, resource, span):
+        spans = self.spans.setdefault(resource, {})
+        spans[span] = spans.get(span, 0) + 1
+        if span > self.max_span.get(resource, -1):
+            self.max_span[resource] = span
+
+    # Stop counting a booking of a resource, finding the longest remaining one if it was the longest
+    def remove_span(self, resource, span):
+        spans = self.spans[resource]
+        spans[span] -= 1
+        if not spans[span]:
+            del spans[span]
+            if span == self.max_span[resource]:
+                if spans:
+                    self.max_span[resource] = max(spans)  # Events have few different lengths
+                else:
+                    del self.spans[resource]
+                    del self.max_span[resource]
+
+    # Collect and sort the bookings of all events
+    def fill(self, events):
+        for event_id, event in self.record_items(events):
+            interval = self.interval(event)
+            if interval is None:
+                continue
+            for resource in self.resources(event):
+                self.bookings.setdefault(resource, []).append(interval + (event_id,))
+                self.add_span(resource, interval[1] - interval[0])
+        for bookings in self.bookings.values():
+            bookings.sort()
+
+    # Add the bookings of one event
+    def add(self, event_id, event):
+        with self.lock:
+            if self.is_pending():
+                return  # The event is already in the events the index will be built from
+            interval = self.interval(event)
+            if interval is None:
+                return
+            for resource in self.resources(event):
+                insort(self.bookings.setdefault(resource, []), interval + (event_id,))
+                self.add_span(resource, interval[1] - interval[0])
+
+    # Remove the bookings of one event
+    def remove(self, event_id, event):
+        with self.lock:
+            if self.is_pending():
+                return
+            interval = self.interval(event)
+            if interval is None:
+                return
+            for resource in self.resources(event):
+                bookings = self.bookings.get(resource, [])
+                position = bisect_left(bookings, interval + (event_id,))
+                if position < len(bookings) and bookings[position] == interval + (event_id,):
+                    del bookings[position]
+                    self.remove_span(resource, interval[1] - interval[0])
+                if not bookings:
+                    self.bookings.pop(resource, None)
+
+    # Get the (start, end, event ID) bookings of a resource overlapping the time range [start, end),
+    # leaving out the bookings of the event `exclude` (the event being modified)
+    def overlapping(self, resource, start, end, exclude=None):
+        with self.lock:
+            self.build()
+            bookings = self.bookings.get(resource)
+            if not bookings:
+                return []
+            # Bookings starting before start - max_span end before start, so the search starts there
+            first = bisect_left(bookings, (start - self.max_span[resource],))
+            last = bisect_left(bookings, (end,))
+            return [booking for booking in bookings[first:last] if booking[1] > start and booking[2] != exclude]
+
+    # Check whether a resource is free for the whole time range [start, end)
+    def is_free(self, resource, start, end, exclude=None):
+        return not self.overlapping(resource, start, end, exclude)
+
+    # Get the resources of `resources` (like all supplier IDs) that are free for the whole time range [start, end)
+    def free(self, resources, start, end, exclude=None):
+        with self.lock:
+            self.build()
+            free = []
+            for resource in resources:
+                bookings = self.bookings.get(resource)
+                if bookings:
+                    # Same search as overlapping(), inlined as this runs once per resource
+                    first = bisect_left(bookings, (start - self.max_span[resource],))
+                    last = bisect_left(bookings, (end,), first)
+                    if any(booking[1] > start and booking[2] != exclude for booking in bookings[first:last]):
+                        continue
+                free.append(resource)
+            return free
+
+
+# Define CalendarIndex class: every event booked on a single calendar, so the events taking place during a
+# time range are found with the same binary search as the bookings of a venue
+class CalendarIndex(BookingIndex):
+    def __init__(self):
+        super().__init__(lambda event: [None])  # The calendar is the only resource
+
+    # Get the (start, end, event ID) of the events taking place during [start, end), in start order
+    def between(self, start, end):
+        return self.overlapping(None, start, end)
+
+
+# In[ ]:
+
+
+
+
@@ -7,9 +7,16 @@
 import pickle  # Import the pickle module for object serialization
 from enum import Enum  # Import Enum class for creating enumerated constants
 
+from Record import SlottedRecord  # Import SlottedRecord for compact instances
+from Repository import Repository  # Import Repository for the shared in-memory records
+from Search import GlobalSearch, PrefixIndex, TextIndex  # Import the search indexes
+
 # Define Client class to represent a client instance
-class Client:
+class Client(SlottedRecord):
     data_file = "clients.pkl"  # File to store client data
+    __slots__ = ("client_id", "name", "address", "contact_details", "budget")  # Attributes stored without a per-instance __dict__
+    search_index = PrefixIndex("name")  # Prefix index over client IDs and names, kept current by the Repository
+    text_index = TextIndex(("name", "address", "contact_details"))  # Words of the clients for the global search
 
     # Initialize client attributes with input validation
     def __init__(self, client_id, name, address, contact_details, budget):
@@ -53,17 +60,39 @@ class Client:
     # Class method to load clients from file
     @classmethod
     def load_clients(cls):
-        try:
-            with open(cls.data_file, "rb") as file:
-                return pickle.load(file)  # Load clients from file using pickle
-        except FileNotFoundError:
-            return {}  # Return an empty dictionary if file does not exist
+        return Repository.load(cls.data_file)  # Load clients once and share them across the application
 
     # Class method to save clients to file
     @classmethod
     def save_clients(cls, clients):
-        with open(cls.data_file, "wb") as file:
-            pickle.dump(clients, file)  # Save clients to file using pickle
+        Repository.save(cls.data_file, clients)  # Save all clients to file using pickle
+
+    # Class method to get a single client by ID, or None if it does not exist
+    @classmethod
+    def get_client(cls, client_id):
+        return Repository.get(cls.data_file, client_id)  # Read only the requested client when the backend allows it
+
+    # Class method to save a single client without rewriting the whole file
+    @classmethod
+    def put_client(cls, client):
+        Repository.put(cls.data_file, client.client_id, client)  # Store the client (written in the background in the storage mode in use)
+
+    # Class method to delete a single client without rewriting the whole file
+    @classmethod
+    def delete_client(cls, client_id):
+        Repository.delete(cls.data_file, client_id)  # Delete it from storage (written in the background in the storage mode in use)
+
+    # Class method to find the IDs of the clients whose ID or name starts with a prefix (ignoring case)
+    @classmethod
+    def search_clients(cls, prefix):
+        cls.load_clients()  # Make sure the clients (and therefore the index) are current
+        return cls.search_index.search(prefix)
+
+
+# Keep the search index current through every load, save, put and delete of clients
+Repository.add_index(Client.data_file, Client.search_index)
+# Include the clients in the global search
+GlobalSearch.register(Client)
 
 
 # In[ ]:
@@ -8,6 +8,10 @@
 import pickle  # Import the pickle module for object serialization
 from enum import Enum  # Import Enum class for creating enumerated constants
 
+from Record import SlottedRecord  # Import SlottedRecord for compact instances
+from Repository import Repository  # Import Repository for the shared in-memory records
+from Search import GlobalSearch, PrefixIndex, TextIndex  # Import the search indexes
+
 # Define JobTitle enum
 class JobTitle(Enum):  # Create a custom enumeration class for job titles
     # Define job title enum options as constants with string values
@@ -20,9 +24,13 @@ class JobTitle(Enum):  # Create a custom enumeration class for job titles
     HANDYMAN = "Handyman"
 
 # Define Employee class
-class Employee:  # Create a class to represent an employee
+class Employee(SlottedRecord):  # Create a class to represent an employee
     # Define data file path as a class variable
     data_file = "employees.pkl"
+    # Define instance attributes as slots so employees have no per-instance __dict__
+    __slots__ = ("name", "employee_id", "department", "job_title", "basic_salary", "age", "date_of_birth", "passport_details")
+    search_index = PrefixIndex("name")  # Prefix index over employee IDs and names, kept current by the Repository
+    text_index = TextIndex(("name", "department", "job_title"))  # Words of the employees for the global search (never their passport details)
 
     # Initialize employee attributes with input validation
     def __init__(self, name, employee_id, department, job_title, basic_salary, age, date_of_birth, passport_details):
@@ -93,10 +101,7 @@ class Employee:  # Create a class to represent an employee
     @classmethod
     def load_employees(cls):  # Define a class method to load employees from a file
         try:
-            with open(cls.data_file, "rb") as file:  # Open the data file in read binary mode
-                return pickle.load(file)  # Load employees from the file using pickle
-        except FileNotFoundError:  # Handle file not found error
-            return {}  # Return an empty dictionary if the file is not found
+            return Repository.load(cls.data_file)  # Load employees once and share them across the application
         except Exception as e:  # Handle other exceptions
             print(f"Error loading employees: {e}")  # Print error message if loading fails
 
@@ -104,11 +109,46 @@ class Employee:  # Create a class to represent an employee
     @classmethod
     def save_employees(cls, employees):  # Define a class method to save employees to a file
         try:
-            with open(cls.data_file, "wb") as file:  # Open the data file in write binary mode
-                pickle.dump(employees, file)  # Save employees to the file using pickle
+            Repository.save(cls.data_file, employees)  # Save all employees to the file using pickle
         except Exception as e:  # Handle exceptions
             print(f"Error saving employees: {e}")  # Print error message if saving fails
 
+    # Class method to get a single employee by ID, or None if it does not exist
+    @classmethod
+    def get_employee(cls, employee_id):  # Define a class method to read one employee
+        try:
+            return Repository.get(cls.data_file, employee_id)  # Read only the requested employee when the backend allows it
+        except Exception as e:  # Handle exceptions
+            print(f"Error loading employee: {e}")  # Print error message if loading fails
+
+    # Class method to save a single employee without rewriting the whole file
+    @classmethod
+    def put_employee(cls, employee):  # Define a class method to save one employee
+        try:
+            Repository.put(cls.data_file, employee.employee_id, employee)  # Store the employee (written in the background in the storage mode in use)
+        except Exception as e:  # Handle exceptions
+            print(f"Error saving employee: {e}")  # Print error message if saving fails
+
+    # Class method to delete a single employee without rewriting the whole file
+    @classmethod
+    def delete_employee(cls, employee_id):  # Define a class method to delete one employee
+        try:
+            Repository.delete(cls.data_file, employee_id)  # Delete it from storage (written in the background in the storage mode in use)
+        except Exception as e:  # Handle exceptions
+            print(f"Error deleting employee: {e}")  # Print error message if deleting fails
+
+    # Class method to find the IDs of the employees whose ID or name starts with a prefix (ignoring case)
+    @classmethod
+    def search_employees(cls, prefix):
+        cls.load_employees()  # Make sure the employees (and therefore the index) are current
+        return cls.search_index.search(prefix)
+
+
+# Keep the search index current through every load, save, put and delete of employees
+Repository.add_index(Employee.data_file, Employee.search_index)
+# Include the employees in the global search
+GlobalSearch.register(Employee)
+
 
 # In[ ]:
 
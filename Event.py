@@ -8,6 +8,13 @@
 import pickle  # Import the pickle module for object serialization
 from enum import Enum  # Import Enum class for creating enumerated constants
 import datetime  # Import datetime module for handling date and time
+import threading  # Import threading module to guard the resolved event cache
+from collections import OrderedDict  # Import OrderedDict to evict the least recently used resolved events
+
+from Record import SlottedRecord  # Import SlottedRecord for compact instances
+from Repository import Repository, RecordIndex  # Import Repository for the shared in-memory records
+from Search import GlobalSearch, PrefixIndex, TextIndex  # Import the search indexes
+from Booking import BookingIndex, CalendarIndex, day_interval, event_interval, format_time, to_epoch  # Import the booking index for overlap checks
 
 #import necessary classes from other files
 from Client import Client
@@ -23,9 +30,32 @@ class EventType(Enum):
     THEMED_PARTY = "Themed Party"
     GRADUATION = "Graduation"
 
+# Get the venues an event books: the normalized venue address (events refer to venues by address)
+def booked_venues(event):
+    address = getattr(event, "venue_address", None)
+    return [Venue.address_index.normalize(address)] if isinstance(address, str) else []
+
+
+# Get the suppliers an event books (a supplier named for two roles is booked once)
+def booked_suppliers(event):
+    supplier_ids = dict.fromkeys(getattr(event, role, None) for role in ResolvedEvent.supplier_roles)
+    return [supplier_id for supplier_id in supplier_ids if supplier_id is not None]
+
+
 # Define Event class to represent an event instance
-class Event:
+class Event(SlottedRecord):
     data_file = "events.pkl"  # File to store event data
+    # Attributes stored without a per-instance __dict__
+    __slots__ = ("event_id", "event_type", "theme", "date", "time", "duration", "venue_address", "client_id", "guest_list",
+                 "catering_company", "cleaning_company", "decorations_company", "entertainment_company",
+                 "furniture_supply_company", "invoice",
+                 "start", "end")  # Start and end of the event in epoch seconds, worked out once from date, time and duration
+    search_index = PrefixIndex("theme")  # Prefix index over event IDs and themes, kept current by the Repository
+    text_index = TextIndex(("event_type", "theme", "date", "venue_address", "client_id", "catering_company", "cleaning_company",
+                            "decorations_company", "entertainment_company", "furniture_supply_company"))  # Words of the events for the global search
+    venue_bookings = BookingIndex(booked_venues)  # Time ranges each venue is booked for, kept current by the Repository
+    supplier_bookings = BookingIndex(booked_suppliers)  # Time ranges each supplier is booked for, kept current by the Repository
+    calendar_index = CalendarIndex()  # Time ranges of all events in start order, kept current by the Repository
 
     # Initialize event attributes with input validation
     def __init__(self, event_id, event_type, theme, date, time, duration, venue_address, client_id, guest_list,
@@ -41,23 +71,26 @@ class Event:
         
         # Validate date format (should be dd/mm/yyyy)
         try:
-            datetime.datetime.strptime(date, "%d/%m/%Y")
+            parsed_date = datetime.datetime.strptime(date, "%d/%m/%Y")
         except ValueError:
             raise ValueError("Date format should be dd/mm/yyyy")
         
         # Validate time format (should be hh:mm)
         try:
-            datetime.datetime.strptime(time, "%H:%M")
+            parsed_time = datetime.datetime.strptime(time, "%H:%M")
         except ValueError:
             raise ValueError("Time format should be hh:mm")
         
         # Validate duration (must be a positive integer)
         if not isinstance(duration, int) or duration <= 0:
             raise ValueError("Duration must be a positive integer")
+
+        # Keep the parsed start and end, so range queries, sorting and overlap checks compare integers
+        start = to_epoch(datetime.datetime.combine(parsed_date.date(), parsed_time.time()))
+        end = start + duration * 3600
         
         # Validate venue address against existing venues
-        venues = Venue.load_venues()
-        venue = next((v for v in venues.values() if v.address == venue_address), None)
+        venue = Venue.find_by_address(venue_address)
         if not venue:
             raise ValueError("Venue with address {} does not exist".format(venue_address))
         
@@ -70,35 +103,38 @@ class Event:
         if not isinstance(guest_list, list):
             raise ValueError("Guest list must be a list")
         
-        guests = Guest.load_guests()
-        for guest_id in guest_list:
-            if not isinstance(guest_id, str):
-                raise ValueError("Each guest ID in the guest list must be a string")
-            if guest_id not in guests:
-                raise ValueError(f"Guest with ID {guest_id} does not exist")
+        # Check the whole guest list at once and report every unknown guest
+        missing_guests = Guest.find_missing_guests(guest_list)
+        if len(missing_guests) == 1:
+            raise ValueError(f"Guest with ID {missing_guests[0]} does not exist")
+        if missing_guests:
+            raise ValueError("Guests with IDs {} do not exist".format(", ".join(missing_guests)))
         
+        # Validate the five companies against existing suppliers (loaded once from the shared repository)
+        suppliers = Supplier.load_suppliers()
+
         # Validate catering company against existing suppliers
-        catering_supplier = Supplier.load_suppliers().get(catering_company)
+        catering_supplier = suppliers.get(catering_company)
         if not catering_supplier:
             raise ValueError("Catering company with ID {} does not exist".format(catering_company))
         
         # Validate cleaning company against existing suppliers
-        cleaning_supplier = Supplier.load_suppliers().get(cleaning_company)
+        cleaning_supplier = suppliers.get(cleaning_company)
         if not cleaning_supplier:
             raise ValueError("Cleaning company with ID {} does not exist".format(cleaning_company))
         
         # Validate decorations company against existing suppliers
-        decorations_supplier = Supplier.load_suppliers().get(decorations_company)
+        decorations_supplier = suppliers.get(decorations_company)
         if not decorations_supplier:
             raise ValueError("Decorations company with ID {} does not exist".format(decorations_company))
         
         # Validate entertainment company against existing suppliers
-        entertainment_supplier = Supplier.load_suppliers().get(entertainment_company)
+        entertainment_supplier = suppliers.get(entertainment_company)
         if not entertainment_supplier:
             raise ValueError("Entertainment company with ID {} does not exist".format(entertainment_company))
         
         # Validate furniture supply company against existing suppliers
-        furniture_supplier = Supplier.load_suppliers().get(furniture_supply_company)
+        furniture_supplier = suppliers.get(furniture_supply_company)
         if not furniture_supplier:
             raise ValueError("Furniture supply company with ID {} does not exist".format(furniture_supply_company))
         
@@ -110,6 +146,22 @@ class Event:
         if not (venue.min_guests <= len(guest_list) <= venue.max_guests):
             raise ValueError("Number of guests does not meet venue capacity")
 
+        # Validate that the venue is not booked by another event at an overlapping time
+        conflicts = Event.venue_bookings_between(venue_address, start, end, exclude=event_id)
+        if conflicts:
+            conflict_start, conflict_end, conflict_id = conflicts[0]
+            raise ValueError("Venue is already booked by event {} from {} to {}".format(
+                conflict_id, format_time(conflict_start), format_time(conflict_end)))
+
+        # Validate that none of the five suppliers is booked by another event at an overlapping time
+        for supplier_id in dict.fromkeys((catering_company, cleaning_company, decorations_company, entertainment_company,
+                                          furniture_supply_company)):
+            conflicts = Event.supplier_bookings_between(supplier_id, start, end, exclude=event_id)
+            if conflicts:
+                conflict_start, conflict_end, conflict_id = conflicts[0]
+                raise ValueError("Supplier {} is already booked by event {} from {} to {}".format(
+                    supplier_id, conflict_id, format_time(conflict_start), format_time(conflict_end)))
+
         # Set event attributes
         self.event_id = event_id
         self.event_type = event_type
@@ -126,37 +178,30 @@ class Event:
         self.entertainment_company = entertainment_company
         self.furniture_supply_company = furniture_supply_company
         self.invoice = invoice
+        self.start = start
+        self.end = end
+
+    # Restore an event from a pickle; events pickled before start and end were stored get them worked out here
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if not hasattr(self, "start"):
+            try:
+                self.start, self.end = event_interval(self.date, self.time, self.duration)
+            except (AttributeError, TypeError, ValueError):
+                self.start = self.end = None  # Not a valid date, time or duration
 
-    # Get event details as a dictionary
+    # Get event details as a dictionary, with the guests, suppliers, client and venue resolved from their IDs
     def get_event_details(self):
-        return {
-            "Event ID": self.event_id,
-            "Type": self.event_type.value,  # Retrieve enum value
-            "Theme": self.theme,
-            "Date": self.date,
-            "Time": self.time,
-            "Duration": self.duration,
-            "Venue Address": self.venue_address,
-            "Client ID": self.client_id,
-            # Get guest details for each guest in the guest list
-            "Guest List": [guest.get_guest_details() for guest in self.guest_list],
-            # Retrieve company name from Supplier class assuming it has a 'name' attribute
-            "Catering Company": self.catering_company.name,
-            "Cleaning Company": self.cleaning_company.name,
-            "Decorations Company": self.decorations_company.name,
-            "Entertainment Company": self.entertainment_company.name,
-            "Furniture Supply Company": self.furniture_supply_company.name,
-            "Invoice": self.invoice
-        }
+        resolved = ResolvedEventCache.get(self.event_id)
+        if resolved is None or resolved.event is not self:
+            resolved = ResolvedEvent(self)  # Not stored (or changed since): join without caching
+        return resolved.get_details()
 
     # Class method to load events from file
     @classmethod
     def load_events(cls):
         try:
-            with open(cls.data_file, "rb") as file:
-                return pickle.load(file) or {}  # Load events from file or return an empty dictionary
-        except FileNotFoundError:
-            return {}  # Return an empty dictionary if file does not exist
+            return Repository.load(cls.data_file)  # Load events once and share them across the application
         except Exception as e:
             print(f"Error loading events: {e}")
             return {}  # Return an empty dictionary if an error occurs during loading
@@ -165,11 +210,246 @@ class Event:
     @classmethod
     def save_events(cls, events):
         try:
-            with open(cls.data_file, "wb") as file:
-                pickle.dump(events, file)  # Save events to file using pickle
+            Repository.save(cls.data_file, events)  # Save all events to file using pickle
         except Exception as e:
             print(f"Error saving events: {e}")  # Print error message if saving fails
 
+    # Class method to get a single event by ID, or None if it does not exist
+    @classmethod
+    def get_event(cls, event_id):
+        try:
+            return Repository.get(cls.data_file, event_id)  # Read only the requested event when the backend allows it
+        except Exception as e:
+            print(f"Error loading event: {e}")
+            return None  # Return None if an error occurs during loading
+
+    # Class method to save a single event without rewriting the whole file
+    @classmethod
+    def put_event(cls, event):
+        try:
+            Repository.put(cls.data_file, event.event_id, event)  # Store the event (written in the background in the storage mode in use)
+        except Exception as e:
+            print(f"Error saving event: {e}")  # Print error message if saving fails
+
+    # Class method to delete a single event without rewriting the whole file
+    @classmethod
+    def delete_event(cls, event_id):
+        try:
+            Repository.delete(cls.data_file, event_id)  # Delete it from storage (written in the background in the storage mode in use)
+        except Exception as e:
+            print(f"Error deleting event: {e}")  # Print error message if deleting fails
+
+    # Class method to find the IDs of the events whose ID or theme starts with a prefix (ignoring case)
+    @classmethod
+    def search_events(cls, prefix):
+        cls.load_events()  # Make sure the events (and therefore the index) are current
+        return cls.search_index.search(prefix)
+
+    # Class method to get the events taking place (at least partly) from `start` up to `end`, in start order.
+    # Both can be epoch seconds, datetimes, dates or "dd/mm/yyyy" / "dd/mm/yyyy hh:mm" strings.
+    @classmethod
+    def events_between(cls, start, end):
+        events = cls.load_events()  # Make sure the events (and therefore the index) are current
+        return [events[event_id] for event_start, event_end, event_id in cls.calendar_index.between(to_epoch(start), to_epoch(end))
+                if event_id in events]
+
+    # Class method to get the events taking place (at least partly) on a day, given like the bounds of events_between
+    @classmethod
+    def events_on(cls, day):
+        start = to_epoch(day)
+        start -= start % (24 * 3600)  # Midnight of that day
+        return cls.events_between(start, start + 24 * 3600)
+
+    # Class method to get the (start, end, event ID) bookings of a venue overlapping [start, end) in epoch seconds,
+    # leaving out the event `exclude` (the event being replaced)
+    @classmethod
+    def venue_bookings_between(cls, venue_address, start, end, exclude=None):
+        cls.load_events()  # Make sure the events (and therefore the index) are current
+        return cls.venue_bookings.overlapping(Venue.address_index.normalize(venue_address), start, end, exclude)
+
+    # Class method to get the events booking a venue during an event on `date` at `time` lasting `duration` hours,
+    # as (start, end, event ID) tuples; an empty list means the venue is free
+    @classmethod
+    def venue_conflicts(cls, venue_address, date, time, duration, exclude=None):
+        start, end = event_interval(date, time, duration)
+        return cls.venue_bookings_between(venue_address, start, end, exclude)
+
+    # Class method to get the (start, end, event ID) bookings of a supplier overlapping [start, end) in epoch seconds,
+    # leaving out the event `exclude` (the event being replaced)
+    @classmethod
+    def supplier_bookings_between(cls, supplier_id, start, end, exclude=None):
+        cls.load_events()  # Make sure the events (and therefore the index) are current
+        return cls.supplier_bookings.overlapping(supplier_id, start, end, exclude)
+
+    # Class method to get the IDs of the suppliers free on `date` ("dd/mm/yyyy"): for the whole day, or only
+    # during an event at `time` lasting `duration` hours when those are given
+    @classmethod
+    def free_suppliers(cls, date, time=None, duration=None, exclude=None):
+        start, end = event_interval(date, time, duration) if time else day_interval(date)
+        suppliers = Supplier.load_suppliers()
+        cls.load_events()
+        return cls.supplier_bookings.free(suppliers, start, end, exclude)
+
+    # Class method to check whether a venue is free during an event on `date` at `time` lasting `duration` hours
+    @classmethod
+    def venue_is_free(cls, venue_address, date, time, duration, exclude=None):
+        return not cls.venue_conflicts(venue_address, date, time, duration, exclude)
+
+
+# Define ResolvedEvent class: an event joined once with the records its IDs refer to
+class ResolvedEvent:
+    supplier_roles = ("catering_company", "cleaning_company", "decorations_company", "entertainment_company",
+                      "furniture_supply_company")  # Event attributes holding supplier IDs
+
+    def __init__(self, event):
+        self.event = event  # The event itself
+        self.client = Client.load_clients().get(event.client_id)  # Client of the event, or None
+        self.venue = Venue.find_by_address(event.venue_address)  # Venue at the event's address, or None
+        guests = Guest.load_guests()
+        self.guests = [guests.get(guest_id) for guest_id in event.guest_list]  # Guests in guest list order (None if deleted)
+        suppliers = Supplier.load_suppliers()
+        self.suppliers = {role: suppliers.get(getattr(event, role)) for role in self.supplier_roles}  # Attribute -> supplier or None
+        self.details = None  # Details dictionary, made on first use
+
+    # Get the (data file, key) of every record this resolved event was joined with
+    def dependencies(self):
+        yield Event.data_file, self.event.event_id
+        yield Client.data_file, self.event.client_id
+        yield Venue.data_file, Venue.address_index.normalize(self.event.venue_address)  # Venues are found by address
+        for guest_id in self.event.guest_list:
+            yield Guest.data_file, guest_id
+        for role in self.supplier_roles:
+            yield Supplier.data_file, getattr(self.event, role)
+
+    # Get the event details as a dictionary, with names instead of IDs
+    def get_details(self):
+        if self.details is not None:
+            return self.details
+        event = self.event
+        name = lambda record, record_id: record.name if record is not None else f"{record_id} (not found)"
+        details = {
+            "Event ID": event.event_id,
+            "Type": event.event_type.value if isinstance(event.event_type, Enum) else event.event_type,
+            "Theme": event.theme,
+            "Date": event.date,
+            "Time": event.time,
+            "Duration": event.duration,
+            "Venue": name(self.venue, event.venue_address),
+            "Venue Address": event.venue_address,
+            "Client": name(self.client, event.client_id),
+            "Client ID": event.client_id,
+            # Get guest details for each guest in the guest list
+            "Guest List": [guest.get_guest_details() if guest is not None else {"Guest ID": guest_id}
+                           for guest_id, guest in zip(event.guest_list, self.guests)],
+        }
+        for role, label in zip(self.supplier_roles, ("Catering Company", "Cleaning Company", "Decorations Company",
+                                                      "Entertainment Company", "Furniture Supply Company")):
+            details[label] = name(self.suppliers[role], getattr(event, role))
+        details["Invoice"] = event.invoice
+        self.details = details
+        return details
+
+
+# Define ResolvedEventCache class to keep the most recently used resolved events. An entry is dropped
+# as soon as the event or one of the records it was joined with is changed or deleted, and all entries
+# are dropped when one of those data files is loaded again or saved as a whole.
+class ResolvedEventCache:
+    max_size = 1000  # Number of resolved events kept
+
+    _resolved = OrderedDict()  # Event ID -> ResolvedEvent, least recently used first
+    _dependents = {}  # (data file, key) -> IDs of the cached events joined with that record
+    _generation = 0  # Increased on every invalidation, so a join racing with a change is not cached
+    _lock = threading.RLock()  # Guards the cache
+
+    # Class method to get the resolved event of an event ID, or None if there is no such event
+    @classmethod
+    def get(cls, event_id):
+        with cls._lock:
+            resolved = cls._resolved.get(event_id)
+            if resolved is not None:
+                cls._resolved.move_to_end(event_id)
+                return resolved
+
+        # Load the joined data files first: loading them drops the cache, which would discard this join
+        events = Event.load_events()
+        for load in (Client.load_clients, Venue.load_venues, Guest.load_guests, Supplier.load_suppliers):
+            load()
+        with cls._lock:
+            generation = cls._generation
+        event = events.get(event_id)
+        if event is None:
+            return None
+        resolved = ResolvedEvent(event)  # Join outside the lock, so changes are not held up by it
+
+        with cls._lock:
+            if generation == cls._generation:
+                cls._resolved[event_id] = resolved
+                for dependency in resolved.dependencies():
+                    cls._dependents.setdefault(dependency, set()).add(event_id)
+                while len(cls._resolved) > cls.max_size:
+                    cls._forget(next(iter(cls._resolved)))
+        return resolved
+
+    # Class method to drop a cached event and its dependencies
+    @classmethod
+    def _forget(cls, event_id):
+        resolved = cls._resolved.pop(event_id, None)
+        if resolved is None:
+            return
+        for dependency in resolved.dependencies():
+            event_ids = cls._dependents.get(dependency)
+            if event_ids is not None:
+                event_ids.discard(event_id)
+                if not event_ids:
+                    del cls._dependents[dependency]
+
+    # Class method to drop the cached events joined with one record
+    @classmethod
+    def invalidate(cls, data_file, key):
+        with cls._lock:
+            cls._generation += 1
+            for event_id in list(cls._dependents.get((data_file, key), ())):
+                cls._forget(event_id)
+
+    # Class method to drop every cached event
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._generation += 1
+            cls._resolved.clear()
+            cls._dependents.clear()
+
+
+# Define ResolvedEventInvalidator class: follows the changes of one data file for the ResolvedEventCache
+class ResolvedEventInvalidator(RecordIndex):
+    def __init__(self, data_file, dependency_key=None):
+        self.data_file = data_file  # Data file followed
+        self.dependency_key = dependency_key  # Function (key, record) -> key events depend on, or None for the record ID
+
+    def rebuild(self, records):
+        ResolvedEventCache.clear()
+
+    def add(self, key, record):
+        ResolvedEventCache.invalidate(self.data_file, self.dependency_key(key, record) if self.dependency_key else key)
+
+    def remove(self, key, record):
+        self.add(key, record)
+
+
+# Keep the search index current through every load, save, put and delete of events
+Repository.add_index(Event.data_file, Event.search_index)
+# Include the events in the global search
+GlobalSearch.register(Event)
+# Keep the venue and supplier bookings current through every load, save, put and delete of events
+Repository.add_index(Event.data_file, Event.venue_bookings)
+Repository.add_index(Event.data_file, Event.supplier_bookings)
+# Keep the calendar current the same way
+Repository.add_index(Event.data_file, Event.calendar_index)
+# Drop resolved events when the event or a record it refers to changes (venues are referred to by address)
+for data_file in (Event.data_file, Client.data_file, Guest.data_file, Supplier.data_file):
+    Repository.add_index(data_file, ResolvedEventInvalidator(data_file))
+Repository.add_index(Venue.data_file, ResolvedEventInvalidator(Venue.data_file, lambda venue_id, venue: Venue.address_index.normalize(venue.address)))
+
 
 # In[ ]:
 
@@ -6,85 +6,438 @@
 
 # Import necessary modules
 import tkinter as tk  # Import the tkinter library and alias it as tk for easier access
-from tkinter import ttk, messagebox, simpledialog  # Import specific modules from tkinter
+from tkinter import ttk, messagebox, simpledialog, filedialog  # Import specific modules from tkinter
 
 import pickle  # Import the pickle module for object serialization
 from enum import Enum  # Import Enum class for creating enumerated constants
 import datetime  # Import datetime module for handling date and time
 import ast  # Import ast module for working with abstract syntax trees (not used in this script)
+import argparse  # Import argparse module for the command line options
+import queue  # Import queue module to pass loading results from worker threads to the GUI
+import threading  # Import threading module to load data in the background
 
 #Import classes from other files
 from Employee import JobTitle,Employee
-from Event import EventType,Event
+from Event import EventType,Event,ResolvedEventCache
 from Client import Client
 from Guest import Guest
 from Supplier import Supplier
 from Venue import Venue
+from Persistence import PersistenceScheduler
+from Importer import Importer
+from Scheduler import Scheduler
+from VirtualTreeview import VirtualTreeview
+from Search import GlobalSearch
+from Sorting import SortIndex, day_month_year
+from Storage import LazyRecordMap, RecordStore
+from Booking import day_interval, format_time
 
 
 
 # Define the main GUI class for the Event Management System
 class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main application window
+    # Tab title -> {sortable column: (attribute sorted by, function converting its values or None)}
+    sort_columns = {
+        "Employees": {"#0": ("employee_id", None), "Name": ("name", None), "Department": ("department", None),
+                      "Job Title": ("job_title", None), "Basic Salary": ("basic_salary", None), "Age": ("age", None),
+                      "Date of Birth": ("date_of_birth", day_month_year), "Passport Details": ("passport_details", None)},
+        "Clients": {"#0": ("client_id", None), "Name": ("name", None), "Address": ("address", None),
+                    "Contact Details": ("contact_details", None), "Budget": ("budget", None)},
+        "Guests": {"#0": ("guest_id", None), "Name": ("name", None), "Address": ("address", None),
+                   "Contact Details": ("contact_details", None)},
+        "Suppliers": {"#0": ("supplier_id", None), "Name": ("name", None), "Address": ("address", None),
+                      "Contact Details": ("contact_details", None)},
+        "Venues": {"#0": ("venue_id", None), "Name": ("name", None), "Address": ("address", None), "Contact": ("contact", None),
+                   "Min Guests": ("min_guests", None), "Max Guests": ("max_guests", None)},
+        "Events": {"#0": ("event_id", None), "Type": ("event_type", None), "Theme": ("theme", None),
+                   "Date": ("start", None), "Time": ("time", None), "Duration": ("duration", None),
+                   "Venue Address": ("venue_address", None), "Client ID": ("client_id", None), "Guests": ("guest_list", len),
+                   "Catering Company": ("catering_company", None), "Cleaning Company": ("cleaning_company", None),
+                   "Decorations Company": ("decorations_company", None), "Entertainment Company": ("entertainment_company", None),
+                   "Furniture Supply Company": ("furniture_supply_company", None), "Invoice": ("invoice", None)},
+    }
+    default_sorting = {"Events": "Date"}  # Tab title -> column its tree view is sorted by until another one is chosen
+    event_page_size = 100  # Number of events shown per page
+
     def __init__(self):
         super().__init__()  # Initialize the main Tkinter application window
         self.title("Event Management System")  # Set the window title
         self.geometry("800x600")  # Set the window size
+        self.protocol("WM_DELETE_WINDOW", self.on_close)  # Write pending changes before the window closes
+
+        # Create a menu bar with bulk import commands
+        menu_bar = tk.Menu(self)
+        import_menu = tk.Menu(menu_bar, tearoff=0)
+        import_menu.add_command(label="Guests...", command=lambda: self.import_records(Guest, "guests", "Guests"))
+        import_menu.add_command(label="Clients...", command=lambda: self.import_records(Client, "clients", "Clients"))
+        import_menu.add_command(label="Suppliers...", command=lambda: self.import_records(Supplier, "suppliers", "Suppliers"))
+        import_menu.add_command(label="Venues...", command=lambda: self.import_records(Venue, "venues", "Venues"))
+        menu_bar.add_cascade(label="Import", menu=import_menu)
+        schedule_menu = tk.Menu(menu_bar, tearoff=0)
+        schedule_menu.add_command(label="Event Requests...", command=self.schedule_requests)
+        menu_bar.add_cascade(label="Schedule", menu=schedule_menu)
+        self.config(menu=menu_bar)
+
+        # Create a status bar showing the progress of loading the data, and then whether all changes are saved
+        self.status_frame = ttk.Frame(self)
+        self.status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_label = tk.Label(self.status_frame, text="Loading data...")
+        self.status_label.pack(side=tk.LEFT, padx=5, pady=2)
+        self.progress_bar = ttk.Progressbar(self.status_frame, mode="determinate")
+        self.progress_bar.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=5, pady=2)
+
+        # Create a search box that searches the records of every tab at once
+        global_search_frame = ttk.Frame(self)
+        global_search_frame.pack(side=tk.TOP, fill=tk.X)
+        tk.Label(global_search_frame, text="Search everything:").pack(side=tk.LEFT, padx=5, pady=5)
+        self.global_search_entry = tk.Entry(global_search_frame, width=40)
+        self.global_search_entry.pack(side=tk.LEFT, padx=5, pady=5)
+        self.global_search_entry.bind("<Return>", lambda event: self.global_search())
+        tk.Button(global_search_frame, text="Search", command=self.global_search).pack(side=tk.LEFT, padx=5, pady=5)
+        self.global_search_window = None  # Window listing the results of the last global search
+        self.free_suppliers_window = None  # Window listing the suppliers free at the last checked date
+        self.calendar_window = None  # Window listing the events of the last calendar query
 
-        # Initialize data storage (load existing data or create new empty dictionaries)
-        try:
-            self.employees = Employee.load_employees()  # Load employee data from file
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load employee data: {e}")
-            self.employees = {}  # Initialize empty dictionary for employees if loading fails
-        
-        # Repeat the above process for other data types: events, clients, guests, suppliers, and venues
-        try:
-            self.events = Event.load_events()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load event data: {e}")
-            self.events = {}
+        # Create a notebook (tabbed interface) to organize different functionalities
+        self.notebook = ttk.Notebook(self)  # Create a ttk Notebook widget
+        self.notebook.pack(fill=tk.BOTH, expand=True)  # Pack the notebook to fill the main window
 
+        # Create an empty frame for each tab; its widgets are only built when the tab is first selected
+        # Tab title -> method building the widgets of the tab into its frame
+        self.tab_builders = {
+            "Employees": self.create_employee_tab,  # Method to create the employee management tab
+            "Clients": self.create_client_tab,  # Method to create the client management tab
+            "Guests": self.create_guest_tab,  # Method to create the guest management tab
+            "Venues": self.create_venue_tab,  # Method to create the venue management tab
+            "Suppliers": self.create_supplier_tab,  # Method to create the supplier management tab
+            "Events": self.create_event_tab,  # Method to create the event management tab
+        }
+        self.tab_frames = {}  # Tab title -> frame of the tab
+        self.built_tabs = set()  # Titles of the tabs whose widgets have been built
+        self.search_filters = {}  # Tab title -> (tree view, search entry, search method) of the built tabs
+        self.tree_sorting = {}  # Tab title -> (sorted column, descending) of the sorted tree views
+        self.detached_rows = {}  # Plain tree view -> item IDs of its rows detached by filter_tree
+        for title in self.tab_builders:
+            self.tab_frames[title] = ttk.Frame(self.notebook)
+            self.notebook.add(self.tab_frames[title], text=title)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+        # Load existing data into the shared repository in the background, one worker thread per data file.
+        # Each tab stays disabled until its data has arrived, so the window is usable right away.
+        # Tab title -> (load method, method filling the tab's tree view, name used in error messages, model class)
+        self.loaders = {
+            "Employees": (Employee.load_employees, self.refresh_employee_tree, "employee", Employee),
+            "Clients": (Client.load_clients, self.refresh_client_tree, "client", Client),
+            "Guests": (Guest.load_guests, self.refresh_guest_tree, "guest", Guest),
+            "Venues": (Venue.load_venues, self.refresh_venue_tree, "venue", Venue),
+            "Suppliers": (Supplier.load_suppliers, self.refresh_supplier_tree, "supplier", Supplier),
+            "Events": (Event.load_events, self.refresh_event_tree, "event", Event),
+        }
+        self.start_loading()
+
+        # Changes are written by the PersistenceScheduler's writer thread, which reports every write here
+        self.saved = queue.Queue()  # (data file, error or None) of every finished write
+        PersistenceScheduler.add_listener(lambda data_file, error: self.saved.put((data_file, error)))
+        self.after(200, self.poll_saving)
+        self.build_tab(self.notebook.tab(self.notebook.select(), "text"))  # Build the tab shown first
+
+    # Method to build the widgets of a tab the first time it is selected
+    def on_tab_changed(self, event=None):
+        self.build_tab(self.notebook.tab(self.notebook.select(), "text"))
+
+    # Method to build the widgets of a tab (once) and fill its tree view if its data is already loaded
+    def build_tab(self, title):
+        if title in self.built_tabs:
+            return
+        self.built_tabs.add(title)
+        self.tab_builders[title](self.tab_frames[title])
+        self.refresh_tab(title)
+
+    # Method to fill the tree view of a tab again, if the tab has been built and its data is loaded
+    def refresh_tab(self, title):
+        if title in self.built_tabs and title not in self.loading:
+            self.loaders[title][1]()
+            if self.is_filtered(title):
+                self.filter_tree(title)  # Keep the current search filter and sort order
+
+    # Method to check whether a built tab shows its rows filtered by a search or in a sorted order
+    def is_filtered(self, title):
+        return title in self.search_filters and (bool(self.search_filters[title][1].get().strip()) or title in self.tree_sorting)
+
+    # Method to show only the rows whose ID or name starts with the text of the tab's search entry
+    # (all rows when it is empty), in the order of the sorted column if there is one.
+    # Plain tree views detach the other rows; virtual ones get the matching keys.
+    def filter_tree(self, title):
+        if title in self.loading:
+            return  # The rows are shown once the data is loaded
+        tree, entry, search = self.search_filters[title]
+        prefix = entry.get().strip()
+        index = None
+        if title in self.tree_sorting:
+            column, descending = self.tree_sorting[title]
+            index = self.sort_index(title, column)
+        if title == "Events" and index is not None and not prefix:
+            # Only the events of the page shown are read from the sort index
+            start, stop = self.event_page_range(index.count())
+            keys = index.ordered(descending, start, stop)
+        else:
+            if index is not None:
+                keys = index.sort_keys(search(prefix), descending) if prefix else index.ordered(descending)
+            else:
+                keys = search(prefix) if prefix else list(self.loaders[title][0]() or {})
+            if title == "Events":
+                start, stop = self.event_page_range(len(keys))
+                keys = keys[start:stop]  # Only one page of events is shown
+        if isinstance(tree, VirtualTreeview):
+            tree.set_rows(keys)
+        else:
+            # Remember the detached rows, so clear_tree deletes them without asking Tk about every record
+            shown = tree.get_children("")
+            self.detached_rows[tree] = (self.detached_rows.get(tree, set()) | set(shown)) - set(keys)
+            tree.set_children("", *keys)
+
+    # Method to make the columns of a tab's tree view sortable by clicking their headings
+    def make_sortable(self, title):
+        tree = self.search_filters[title][0]
+        for column in self.sort_columns[title]:
+            tree.heading(column, command=lambda column=column: self.sort_tree(title, column))
+
+    # Method to get the sort index of a column of a tab (created on first use)
+    def sort_index(self, title, column):
+        attribute, convert = self.sort_columns[title][column]
+        return SortIndex.of(self.loaders[title][3].data_file, attribute, convert)
+
+    # Method to sort a tab's tree view by a column (clicking the sorted column again reverses the order).
+    # The order comes from a sort index that is kept current, so no rows are read again or sorted here.
+    # A column sorted for the first time has its index built on a worker thread; the rows keep their
+    # current order until it is ready.
+    def sort_tree(self, title, column):
+        index = self.sort_index(title, column)
+        if index.is_pending():
+            self.status_label.config(text=f"Sorting {title.lower()}...")
+            worker = threading.Thread(target=index.build, daemon=True)
+            worker.start()
+            self.after(50, self.wait_for_sort, worker, title, column)
+            return
+        descending = self.tree_sorting.get(title) == (column, False)
+        self.tree_sorting[title] = (column, descending)
+        tree = self.search_filters[title][0]
+        for sortable_column in self.sort_columns[title]:
+            text = tree.heading(sortable_column, "text").rstrip(" ▲▼")
+            if sortable_column == column:
+                text += " ▼" if descending else " ▲"
+            tree.heading(sortable_column, text=text)
+        self.filter_tree(title)
+
+    # Method to sort a tab's tree view once the worker thread building the sort index has finished
+    def wait_for_sort(self, worker, title, column):
+        if worker.is_alive():
+            self.after(50, self.wait_for_sort, worker, title, column)
+            return
+        self.update_save_status()
+        self.sort_tree(title, column)
+
+    # Method to delete every row of a plain tree view, including the rows detached by a search filter
+    def clear_tree(self, tree):
+        tree.delete(*tree.get_children())
+        tree.delete(*self.detached_rows.pop(tree, ()))
+
+    # Method to load every data file in a worker thread and start polling for the results
+    def start_loading(self):
+        self.loading = set(self.loaders)  # Tabs whose data has not arrived yet
+        self.loaded = queue.Queue()  # (tab title, error or None) of every finished load
+        self.progress_bar.configure(maximum=len(self.loaders), value=0)
+        for title, (load, _, _, model) in self.loaders.items():
+            self.notebook.tab(self.tab_frames[title], state="disabled")
+            threading.Thread(target=self.load_in_background, args=(title, load, model), daemon=True).start()
+        self.after(50, self.poll_loading)
+
+    # Method run by a worker thread: load one data file and build its search indexes and the sort index
+    # of its tab's sorted column, so the first search or sort on the GUI thread does not have to (the GUI
+    # is only updated from poll_loading). Lazily loaded snapshots are left undecoded, and their indexes
+    # are built by their first query.
+    def load_in_background(self, title, load, model):
         try:
-            self.clients = Client.load_clients()
+            records = load()
+            if not isinstance(records, LazyRecordMap):
+                model.search_index.build()
+                model.text_index.build()
+                column = self.tree_sorting.get(title, (self.default_sorting.get(title), False))[0]
+                if column is not None:
+                    self.sort_index(title, column).build()
+            self.loaded.put((title, None))
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load client data: {e}")
-            self.clients = {}
+            self.loaded.put((title, e))
 
+    # Method to handle the finished loads on the GUI thread, polled with after() until all data has arrived
+    def poll_loading(self):
+        while True:
+            try:
+                title, error = self.loaded.get_nowait()
+            except queue.Empty:
+                break
+            self.on_data_loaded(title, error)
+
+        if self.loading:
+            self.status_label.config(text="Loading {}...".format(", ".join(title.lower() for title in self.loaders if title in self.loading)))
+            self.after(50, self.poll_loading)
+        else:
+            self.progress_bar.pack_forget()  # Everything is loaded
+            self.update_save_status()
+
+    # Method to fill (if already built) and enable the tab of a data file once it has been loaded
+    def on_data_loaded(self, title, error):
+        what = self.loaders[title][2]
+        self.loading.discard(title)
+        self.progress_bar.step(1)
+        if error is not None:
+            messagebox.showerror("Error", f"Failed to load {what} data: {error}")
+        else:
+            try:
+                self.refresh_tab(title)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to show {what} data: {e}")
+        self.notebook.tab(self.tab_frames[title], state="normal")
+        # Switch to the first tab that is ready while the selected one is still loading (this builds it)
+        if self.notebook.tab(self.notebook.select(), "state") == "disabled":
+            self.notebook.select(self.tab_frames[title])
+
+    # Method to search the records of every tab and list the best matches in a window
+    def global_search(self):
+        query = self.global_search_entry.get().strip()
+        if not query:
+            messagebox.showerror("Error", "Please enter something to search for.")
+            return
         try:
-            self.guests = Guest.load_guests()
+            results = GlobalSearch.search(query)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load guest data: {e}")
-            self.guests = {}
+            messagebox.showerror("Error", f"Search failed: {e}")
+            return
 
+        # Reuse the results window of the previous search
+        if self.global_search_window is None or not self.global_search_window.winfo_exists():
+            self.global_search_window = tk.Toplevel(self)
+            self.global_search_window.geometry("700x300")
+            self.global_search_tree = ttk.Treeview(self.global_search_window, columns=("Type", "Details"))
+            self.global_search_tree.heading("#0", text="ID")
+            self.global_search_tree.heading("Type", text="Type")
+            self.global_search_tree.heading("Details", text="Details")
+            self.global_search_tree.pack(fill="both", expand=True)
+            self.global_search_tree.bind("<Double-1>", lambda event: self.open_global_search_result())
+        self.global_search_window.title(f"Search results for: {query}")
+        self.global_search_window.lift()
+
+        # Results are listed best first; double-clicking one shows it in its tab
+        self.global_search_tree.delete(*self.global_search_tree.get_children())
+        self.global_search_results = {}  # Item ID -> (tab title, record ID)
+        for name, key, record in results:
+            model = type(record)
+            details = ", ".join(str(getattr(record, attribute)) for attribute in model.text_index.attributes if getattr(record, attribute, None))
+            item = self.global_search_tree.insert("", "end", text=key, values=(name, details))
+            self.global_search_results[item] = (name + "s", key)
+        if not results:
+            self.global_search_tree.insert("", "end", text="", values=("", "No matches"))
+
+    # Method to show the double-clicked global search result in its tab, filtered to that record
+    def open_global_search_result(self):
+        selection = self.global_search_tree.selection()
+        if not selection or selection[0] not in self.global_search_results:
+            return
+        title, key = self.global_search_results[selection[0]]
+        if self.notebook.tab(self.tab_frames[title], "state") == "disabled":
+            return  # The data of this tab is still loading
+        self.notebook.select(self.tab_frames[title])
+        self.build_tab(title)
+        entry = self.search_filters[title][1]
+        entry.delete(0, tk.END)
+        entry.insert(0, key)
+        self.filter_tree(title)
+
+    # Method to bulk import records of a model from a CSV or JSON Lines file
+    def import_records(self, model, what, title):
+        path = filedialog.askopenfilename(title=f"Import {what}", filetypes=[("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl"), ("All files", "*.*")])
+        if not path:
+            return  # Import cancelled
         try:
-            self.suppliers = Supplier.load_suppliers()
+            result = Importer.import_file(path, model)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load supplier data: {e}")
-            self.suppliers = {}
-
+            messagebox.showerror("Error", f"Failed to import {what}: {e}")
+            return
+        # Show how many rows were imported and the first rejected rows
+        if result.failed:
+            messagebox.showwarning("Import finished with errors", result.summary())
+        else:
+            messagebox.showinfo("Success", result.summary())
+        self.refresh_tab(title)
+
+    # Method to assign venues, days and suppliers to a file of event requests and add the resulting events
+    def schedule_requests(self):
+        path = filedialog.askopenfilename(title="Schedule event requests", filetypes=[("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl"), ("All files", "*.*")])
+        if not path:
+            return  # Scheduling cancelled
         try:
-            self.venues = Venue.load_venues()
+            result = Scheduler.schedule_file(path)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load venue data: {e}")
-            self.venues = {}
-
-        # Create a notebook (tabbed interface) to organize different functionalities
-        self.notebook = ttk.Notebook(self)  # Create a ttk Notebook widget
-        self.notebook.pack(fill=tk.BOTH, expand=True)  # Pack the notebook to fill the main window
+            messagebox.showerror("Error", f"Failed to schedule event requests: {e}")
+            return
+        # Show how many events were scheduled and the first requests that could not be
+        if result.unscheduled:
+            messagebox.showwarning("Scheduling finished with unscheduled requests", result.summary())
+        else:
+            messagebox.showinfo("Success", result.summary())
+        self.refresh_tab("Events")
 
-        # Create tabs for different functionalities
-        self.create_employee_tab()  # Method to create the employee management tab
-        self.create_client_tab()  # Method to create the client management tab
-        self.create_guest_tab()  # Method to create the guest management tab
-        self.create_venue_tab()  # Method to create the venue management tab
-        self.create_supplier_tab()  # Method to create the supplier management tab
-        self.create_event_tab()  # Method to create the event management tab
+    # Method to report the finished writes on the GUI thread, polled with after()
+    def poll_saving(self):
+        while True:
+            try:
+                data_file, error = self.saved.get_nowait()
+            except queue.Empty:
+                break
+            if error is not None:
+                messagebox.showerror("Error", f"Failed to save {data_file}: {error}")
+        self.update_save_status()
+        self.after(200, self.poll_saving)
+
+    # Method to show in the status bar whether changes are still waiting to be written
+    def update_save_status(self):
+        if not self.loading:  # The status bar shows the loading progress first
+            self.status_label.config(text="Saving changes..." if PersistenceScheduler.has_pending() else "All changes saved")
+
+    # Method to write every pending change to disk and close the window
+    def on_close(self):
+        self.status_label.config(text="Saving changes...")
+        self.update_idletasks()
+        PersistenceScheduler.flush()  # Waits for the writer thread to write everything
+        self.destroy()
+
+    # Data is always read through the model classes, which share one in-memory copy per data file
+    @property
+    def employees(self):
+        return Employee.load_employees() or {}
+
+    @property
+    def events(self):
+        return Event.load_events()
+
+    @property
+    def clients(self):
+        return Client.load_clients()
+
+    @property
+    def guests(self):
+        return Guest.load_guests()
+
+    @property
+    def suppliers(self):
+        return Supplier.load_suppliers()
+
+    @property
+    def venues(self):
+        return Venue.load_venues()
 
     # Method to create the employee management tab
-    def create_employee_tab(self):
-        employee_tab = ttk.Frame(self.notebook)  # Create a new tab frame for employees
-        self.notebook.add(employee_tab, text="Employees")  # Add the employee tab to the notebook
-
+    def create_employee_tab(self, employee_tab):
         # Add widgets for employee management within the tab
         employee_frame = ttk.LabelFrame(employee_tab, text="Add / Modify Employee")  # Create a labeled frame for employee operations
         employee_frame.pack(padx=10, pady=10, fill=tk.BOTH)  # Pack the employee frame with padding and fill options
@@ -131,7 +484,7 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         search_employee_frame = ttk.LabelFrame(employee_tab, text="Search Employee")  # Create a labeled frame for employee search
         search_employee_frame.pack(padx=10, pady=10, fill=tk.BOTH)  # Pack the search frame with padding and fill options
 
-        tk.Label(search_employee_frame, text="Search by ID:").pack(side=tk.LEFT, padx=5, pady=5)  # Label for search entry
+        tk.Label(search_employee_frame, text="Search by ID or name:").pack(side=tk.LEFT, padx=5, pady=5)  # Label for search entry
         self.employee_search_entry = tk.Entry(search_employee_frame)  # Entry field for search
         self.employee_search_entry.pack(side=tk.LEFT, padx=5, pady=5)  # Pack the search entry field
 
@@ -156,10 +509,11 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         self.employee_tree.heading("Date of Birth", text="Date of Birth")  # Column heading for employee date of birth
         self.employee_tree.heading("Passport Details", text="Passport Details")  # Column heading for employee passport details
 
-        # Insert employee records into the Treeview
-        for emp_id, employee in self.employees.items():  # Iterate over employee dictionary
-            # Insert each employee's details into the Treeview
-            self.employee_tree.insert("", "end", text=emp_id, values=(employee.name, employee.employee_id, employee.department, employee.job_title, employee.basic_salary, employee.age, employee.date_of_birth, employee.passport_details))
+        # Employee records are inserted into the Treeview by refresh_tab once they are loaded
+        # Filter the employees by ID or name prefix while the user types
+        self.search_filters["Employees"] = (self.employee_tree, self.employee_search_entry, Employee.search_employees)
+        self.employee_search_entry.bind("<KeyRelease>", lambda event: self.filter_tree("Employees"))
+        self.make_sortable("Employees")  # Sort the employees by clicking a column heading
 
         # Button to delete selected employee
         delete_employee_button = tk.Button(employee_tree_frame, text="Delete Employee", command=self.delete_employee)  # Create delete button for employees
@@ -210,11 +564,8 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
             basic_salary = float(basic_salary)
             age = int(age)
 
-            # Create a new Employee object and add to dictionary
-            self.employees[employee_id] = Employee(name, employee_id, department, job_title, float(basic_salary), int(age), date_of_birth, passport_details)
-
-            # Save updated employee data to file
-            Employee.save_employees(self.employees)
+            # Create a new Employee object and save it (this also adds it to the shared dictionary)
+            Employee.put_employee(Employee(name, employee_id, department, job_title, float(basic_salary), int(age), date_of_birth, passport_details))
 
             # Show success message
             messagebox.showinfo("Success", "Employee details added successfully.")
@@ -228,8 +579,8 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
             self.dob_entry.delete(0, tk.END)
             self.passport_entry.delete(0, tk.END)
 
-            # Refresh the employee records in the Treeview
-            self.refresh_employee_tree()
+            # Refresh the row of this employee in the Treeview
+            self.refresh_employee_tree(employee_id)
 
         except ValueError as ve:
             # Show error message if data conversion fails
@@ -254,35 +605,53 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         confirm = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete employee with ID: {emp_id}?")
         if confirm:
             try:
-                # Delete the employee from the dictionary
-                del self.employees[emp_id]
-
-                # Save updated employee data to file
-                Employee.save_employees(self.employees)
+                # Delete the employee from the data file and the shared dictionary
+                Employee.delete_employee(emp_id)
 
                 # Show success message
                 messagebox.showinfo("Success", "Employee deleted successfully.")
 
-                # Refresh the employee records in the Treeview
-                self.refresh_employee_tree()
+                # Remove the row of this employee from the Treeview
+                self.refresh_employee_tree(emp_id)
 
             except Exception as e:
                 # Show error message if deletion fails
                 messagebox.showerror("Error", f"Failed to delete employee: {e}")
 
-    def refresh_employee_tree(self):
+    def refresh_employee_tree(self, emp_id=None):
+        # Only update the row of one employee when its ID is given
+        if emp_id is not None:
+            self.sync_tree_row(self.employee_tree, emp_id, self.employees.get(emp_id), self.employee_row)
+            return
+
         # Clear all existing items in the Treeview
-        self.employee_tree.delete(*self.employee_tree.get_children())
+        self.clear_tree(self.employee_tree)
 
-        # Insert updated employee records into the Treeview
+        # Insert updated employee records into the Treeview (the employee ID is the item ID)
         for emp_id, employee in self.employees.items():
-            self.employee_tree.insert("", "end", text=emp_id, values=(employee.name, employee.employee_id, employee.department, employee.job_title, employee.basic_salary, employee.age, employee.date_of_birth, employee.passport_details))
-    def create_client_tab(self):
-        # Create a new frame for the client tab within the notebook
-        client_tab = ttk.Frame(self.notebook)
-        # Add the client tab to the notebook with a specified text label
-        self.notebook.add(client_tab, text="Clients")
+            self.employee_tree.insert("", "end", iid=emp_id, text=emp_id, values=self.employee_row(employee))
+
+    # Get the Treeview values of an employee
+    def employee_row(self, employee):
+        return (employee.name, employee.employee_id, employee.department, employee.job_title, employee.basic_salary, employee.age, employee.date_of_birth, employee.passport_details)
+
+    # Add, update or remove the Treeview row of one record (the record ID is the item ID), instead of rebuilding the whole tree.
+    # While the tab is filtered or sorted the rows are put in order again, as the record may have to move, show or hide.
+    def sync_tree_row(self, tree, key, record, row_values):
+        if record is None:
+            if tree.exists(key):
+                tree.delete(key)  # The record was deleted
+                self.detached_rows.get(tree, set()).discard(key)
+        elif tree.exists(key):
+            tree.item(key, text=key, values=row_values(record))  # The record was modified
+        else:
+            tree.insert("", "end", iid=key, text=key, values=row_values(record))  # The record was added
+        title = next((title for title, (filtered_tree, entry, search) in self.search_filters.items() if filtered_tree is tree), None)
+        if title is not None and self.is_filtered(title):
+            self.filter_tree(title)
 
+    # Method to create the client management tab
+    def create_client_tab(self, client_tab):
         # Create a labeled frame for adding or modifying client details
         client_frame = ttk.LabelFrame(client_tab, text="Add / Modify Client")
         client_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
@@ -315,7 +684,7 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         search_client_frame.pack(padx=10, pady=10, fill=tk.BOTH)
 
         # Label and entry field for searching clients by ID
-        tk.Label(search_client_frame, text="Search by ID:").pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Label(search_client_frame, text="Search by ID or name:").pack(side=tk.LEFT, padx=5, pady=5)
         self.client_search_entry = tk.Entry(search_client_frame)
         self.client_search_entry.pack(side=tk.LEFT, padx=5, pady=5)
         search_client_button = tk.Button(search_client_frame, text="Search", command=self.search_client)
@@ -336,9 +705,11 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         self.client_tree.heading("Contact Details", text="Contact Details")
         self.client_tree.heading("Budget", text="Budget")
 
-        # Insert existing client records into the Treeview
-        for client_id, client in self.clients.items():
-            self.client_tree.insert("", "end", text=client_id, values=(client.name, client.address, client.contact_details, client.budget))
+        # Client records are inserted into the Treeview by refresh_tab once they are loaded
+        # Filter the clients by ID or name prefix while the user types
+        self.search_filters["Clients"] = (self.client_tree, self.client_search_entry, Client.search_clients)
+        self.client_search_entry.bind("<KeyRelease>", lambda event: self.filter_tree("Clients"))
+        self.make_sortable("Clients")  # Sort the clients by clicking a column heading
 
         # Button to delete a selected client from the Treeview
         delete_client_button = tk.Button(client_tree_frame, text="Delete Client", command=self.delete_client)
@@ -385,12 +756,9 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
                 return
 
             try:
-                # Create a new Client object and add it to the clients dictionary
+                # Create a new Client object and save it (this also adds it to the clients dictionary)
                 new_client = Client(client_id, name, address, contact_details, budget)
-                self.clients[client_id] = new_client
-
-                # Save updated clients data to file
-                Client.save_clients(self.clients)
+                Client.put_client(new_client)
 
                 # Show success message
                 messagebox.showinfo("Success", "Client added successfully.")
@@ -402,8 +770,8 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
                 self.client_contact_entry.delete(0, tk.END)
                 self.client_budget_entry.delete(0, tk.END)
 
-                # Refresh the client records in the Treeview
-                self.refresh_client_tree()
+                # Refresh the row of this client in the Treeview
+                self.refresh_client_tree(client_id)
 
             except Exception as e:
                 # Show error message for unexpected errors
@@ -427,38 +795,41 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         confirm = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete client with ID: {client_id}?")
         if confirm:
             try:
-                # Delete the client from the clients dictionary
-                del self.clients[client_id]
-
-                # Save updated clients data to file
-                Client.save_clients(self.clients)
+                # Delete the client from the data file and the clients dictionary
+                Client.delete_client(client_id)
 
                 # Show success message
                 messagebox.showinfo("Success", "Client deleted successfully.")
 
-                # Refresh the client records in the Treeview
-                self.refresh_client_tree()
+                # Remove the row of this client from the Treeview
+                self.refresh_client_tree(client_id)
 
             except Exception as e:
                 # Show error message if deletion fails
                 messagebox.showerror("Error", f"Failed to delete client: {e}")
 
-    def refresh_client_tree(self):
+    def refresh_client_tree(self, client_id=None):
+        # Only update the row of one client when its ID is given
+        if client_id is not None:
+            self.sync_tree_row(self.client_tree, client_id, self.clients.get(client_id), self.client_row)
+            return
+
         # Clear all existing items in the Treeview
-        self.client_tree.delete(*self.client_tree.get_children())
+        self.clear_tree(self.client_tree)
 
-        # Insert updated client records into the Treeview
+        # Insert updated client records into the Treeview (the client ID is the item ID)
         for client_id, client in self.clients.items():
-            self.client_tree.insert("", "end", text=client_id, values=(client.name, client.address, client.contact_details, client.budget))
+            self.client_tree.insert("", "end", iid=client_id, text=client_id, values=self.client_row(client))
+
+    # Get the Treeview values of a client
+    def client_row(self, client):
+        return (client.name, client.address, client.contact_details, client.budget)
     
     
 
     
     # Create guest tab with widgets for guest management
-    def create_guest_tab(self):
-        guest_tab = ttk.Frame(self.notebook)
-        self.notebook.add(guest_tab, text="Guests")
-
+    def create_guest_tab(self, guest_tab):
         # Add widgets for guest management
         guest_frame = ttk.LabelFrame(guest_tab, text="Add / Modify Guest")
         guest_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
@@ -486,7 +857,7 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         search_guest_frame = ttk.LabelFrame(guest_tab, text="Search Guest")
         search_guest_frame.pack(padx=10, pady=10, fill=tk.BOTH)
 
-        tk.Label(search_guest_frame, text="Search by ID:").pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Label(search_guest_frame, text="Search by ID or name:").pack(side=tk.LEFT, padx=5, pady=5)
         self.guest_search_entry = tk.Entry(search_guest_frame)
         self.guest_search_entry.pack(side=tk.LEFT, padx=5, pady=5)
         # Search button
@@ -497,8 +868,14 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         guest_tree_frame = ttk.LabelFrame(guest_tab, text="Guest Records")
         guest_tree_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
 
-        self.guest_tree = ttk.Treeview(guest_tree_frame, columns=("Name", "Address", "Contact Details"), selectmode="browse")
-        self.guest_tree.pack(fill="both", expand=True)
+        # Only the guests in view are inserted into the Treeview; the scrollbar covers all of them
+        guest_tree_container = ttk.Frame(guest_tree_frame)
+        guest_tree_container.pack(fill="both", expand=True)
+        self.guest_tree = VirtualTreeview(guest_tree_container, self.guest_row, columns=("Name", "Address", "Contact Details"), selectmode="browse")
+        self.guest_tree.pack(side=tk.LEFT, fill="both", expand=True)
+        guest_scrollbar = ttk.Scrollbar(guest_tree_container, orient=tk.VERTICAL)
+        guest_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.guest_tree.attach_scrollbar(guest_scrollbar)
 
         # Configure column headings
         self.guest_tree.heading("#0", text="Guest ID")
@@ -506,9 +883,11 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         self.guest_tree.heading("Address", text="Address")
         self.guest_tree.heading("Contact Details", text="Contact Details")
 
-        # Insert guest records into the treeview
-        for guest_id, guest in self.guests.items():
-            self.guest_tree.insert("", "end", text=guest_id, values=(guest.name, guest.address, guest.contact_details))
+        # Guest records are shown in the treeview by refresh_tab once they are loaded
+        # Filter the guests by ID or name prefix while the user types
+        self.search_filters["Guests"] = (self.guest_tree, self.guest_search_entry, Guest.search_guests)
+        self.guest_search_entry.bind("<KeyRelease>", lambda event: self.filter_tree("Guests"))
+        self.make_sortable("Guests")  # Sort the guests by clicking a column heading
 
         # Delete Guest button
         delete_guest_button = tk.Button(guest_tree_frame, text="Delete Guest", command=self.delete_guest)
@@ -542,15 +921,14 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
             messagebox.showerror("Error", "Please select a guest to delete.")
             return
 
-        guest_id = self.guest_tree.item(selected_item, "text")
+        guest_id = selected_item[0]  # Item IDs are the guest IDs (the row may be scrolled out of view)
         confirm = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete guest with ID: {guest_id}?")
         if confirm:
-            del self.guests[guest_id]
-            Guest.save_guests(self.guests)
+            Guest.delete_guest(guest_id)
             messagebox.showinfo("Success", "Guest deleted successfully.")
 
-            # Refresh guest records tree view
-            self.guest_tree.delete(selected_item)
+            # Remove the row of this guest from the tree view
+            self.refresh_guest_tree(guest_id)
         else:
             return
 
@@ -564,8 +942,7 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         if guest_id and name and address and contact_details:
             try:
                 new_guest = Guest(guest_id, name, address, contact_details)
-                self.guests[guest_id] = new_guest
-                Guest.save_guests(self.guests)
+                Guest.put_guest(new_guest)
                 messagebox.showinfo("Success", "Guest details added successfully.")
 
                 # Clear input fields
@@ -574,26 +951,32 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
                 self.guest_address_entry.delete(0, tk.END)
                 self.guest_contact_entry.delete(0, tk.END)
 
-                # Refresh guest records tree view
-                self.refresh_guest_tree()
+                # Refresh the row of this guest in the tree view
+                self.refresh_guest_tree(guest_id)
             except ValueError as ve:
                 messagebox.showerror("Error", f"Failed to add guest: {ve}")
         else:
             messagebox.showerror("Error", "Please fill in all fields.")
 
     # Refresh the guest treeview
-    def refresh_guest_tree(self):
-        self.guest_tree.delete(*self.guest_tree.get_children())
-        for guest_id, guest in self.guests.items():
-            self.guest_tree.insert("", "end", text=guest_id, values=(guest.name, guest.address, guest.contact_details))
+    def refresh_guest_tree(self, guest_id=None):
+        # Only update the row of one guest when its ID is given
+        if guest_id is not None:
+            if self.is_filtered("Guests"):
+                self.filter_tree("Guests")  # The guest may have to move, show or hide
+            else:
+                self.guest_tree.sync_row(guest_id, guest_id in self.guests)
+            return
+        self.guest_tree.set_rows(self.guests)
+
+    # Get the treeview row of a guest
+    def guest_row(self, guest_id):
+        guest = self.guests[guest_id]
+        return guest_id, (guest.name, guest.address, guest.contact_details)
     
     
     # Define method to create supplier tab
-    def create_supplier_tab(self):
-        # Create a frame for the supplier tab
-        supplier_tab = ttk.Frame(self.notebook)
-        self.notebook.add(supplier_tab, text="Suppliers")
-
+    def create_supplier_tab(self, supplier_tab):
         # Add widgets for supplier management
         supplier_frame = ttk.LabelFrame(supplier_tab, text="Add / Modify Supplier")
         supplier_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
@@ -618,7 +1001,7 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         add_supplier_button.grid(row=4, columnspan=2, padx=5, pady=5)
 
         # Add search bar
-        supplier_search_frame = ttk.LabelFrame(supplier_tab, text="Search Supplier by ID")
+        supplier_search_frame = ttk.LabelFrame(supplier_tab, text="Search Supplier by ID or Name")
         supplier_search_frame.pack(padx=10, pady=10, fill=tk.BOTH)
 
         self.supplier_search_entry = tk.Entry(supplier_search_frame)
@@ -639,9 +1022,11 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         self.supplier_tree.heading("Address", text="Address")
         self.supplier_tree.heading("Contact Details", text="Contact Details")
 
-        # Insert supplier records into the treeview
-        for supplier_id, supplier in self.suppliers.items():
-            self.supplier_tree.insert("", "end", text=supplier_id, values=(supplier.name, supplier.address, supplier.contact_details))
+        # Supplier records are inserted into the treeview by refresh_tab once they are loaded
+        # Filter the suppliers by ID or name prefix while the user types
+        self.search_filters["Suppliers"] = (self.supplier_tree, self.supplier_search_entry, Supplier.search_suppliers)
+        self.supplier_search_entry.bind("<KeyRelease>", lambda event: self.filter_tree("Suppliers"))
+        self.make_sortable("Suppliers")  # Sort the suppliers by clicking a column heading
 
         # Delete Supplier button
         delete_supplier_button = tk.Button(supplier_tree_frame, text="Delete Supplier", command=self.delete_supplier)
@@ -662,15 +1047,13 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         confirm = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete supplier with ID: {supplier_id}?")
         # If user confirms deletion
         if confirm:
-            # Delete the supplier from the dictionary
-            del self.suppliers[supplier_id]
-            # Save the updated supplier data
-            Supplier.save_suppliers(self.suppliers)
+            # Delete the supplier from the data file and the dictionary
+            Supplier.delete_supplier(supplier_id)
             # Show success message
             messagebox.showinfo("Success", "Supplier deleted successfully.")
 
-            # Refresh supplier records tree view
-            self.supplier_tree.delete(selected_item)
+            # Remove the row of this supplier from the tree view
+            self.refresh_supplier_tree(supplier_id)
         else:
             return
 
@@ -690,10 +1073,8 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         try:
             # Create a new supplier object
             new_supplier = Supplier(supplier_id, name, address, contact_details)
-            # Add the new supplier to the dictionary
-            self.suppliers[supplier_id] = new_supplier
-            # Save the updated supplier data
-            Supplier.save_suppliers(self.suppliers)
+            # Save the new supplier (this also adds it to the dictionary)
+            Supplier.put_supplier(new_supplier)
             # Show success message
             messagebox.showinfo("Success", "Supplier details added successfully.")
             # Clear input fields
@@ -702,8 +1083,8 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
             self.supplier_address_entry.delete(0, tk.END)
             self.supplier_contact_entry.delete(0, tk.END)
 
-            # Refresh supplier records tree view
-            self.refresh_supplier_tree()
+            # Refresh the row of this supplier in the tree view
+            self.refresh_supplier_tree(supplier_id)
             
         except ValueError as ve:
             # Handle ValueError raised during object creation
@@ -713,12 +1094,20 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
             messagebox.showerror("Error", f"An unexpected error occurred: {e}")
 
     # Define method to refresh the supplier tree view
-    def refresh_supplier_tree(self):
+    def refresh_supplier_tree(self, supplier_id=None):
+        # Only update the row of one supplier when its ID is given
+        if supplier_id is not None:
+            self.sync_tree_row(self.supplier_tree, supplier_id, self.suppliers.get(supplier_id), self.supplier_row)
+            return
         # Clear existing entries in the tree view
-        self.supplier_tree.delete(*self.supplier_tree.get_children())
-        # Insert updated supplier records into the treeview
+        self.clear_tree(self.supplier_tree)
+        # Insert updated supplier records into the treeview (the supplier ID is the item ID)
         for supplier_id, supplier in self.suppliers.items():
-            self.supplier_tree.insert("", "end", text=supplier_id, values=(supplier.name, supplier.address, supplier.contact_details))
+            self.supplier_tree.insert("", "end", iid=supplier_id, text=supplier_id, values=self.supplier_row(supplier))
+
+    # Define method to get the tree view values of a supplier
+    def supplier_row(self, supplier):
+        return (supplier.name, supplier.address, supplier.contact_details)
 
     # Define method to search for a supplier by ID
     def search_supplier_by_id(self):
@@ -744,11 +1133,7 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
             
             
     # Define method to create the venue tab
-    def create_venue_tab(self):
-        # Create a frame for the venue tab
-        venue_tab = ttk.Frame(self.notebook)
-        self.notebook.add(venue_tab, text="Venues")
-
+    def create_venue_tab(self, venue_tab):
         # Add widgets for venue management
         venue_frame = ttk.LabelFrame(venue_tab, text="Add / Modify Venue")
         venue_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
@@ -779,7 +1164,7 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         add_venue_button.grid(row=6, columnspan=2, padx=5, pady=5)
 
         # Add search bar
-        venue_search_frame = ttk.LabelFrame(venue_tab, text="Search Venue by ID")
+        venue_search_frame = ttk.LabelFrame(venue_tab, text="Search Venue by ID, Name or Address")
         venue_search_frame.pack(padx=10, pady=10, fill=tk.BOTH)
 
         self.venue_search_entry = tk.Entry(venue_search_frame)
@@ -802,9 +1187,11 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         self.venue_tree.heading("Min Guests", text="Min Guests")
         self.venue_tree.heading("Max Guests", text="Max Guests")
 
-        # Insert venue records into the treeview
-        for venue_id, venue in self.venues.items():
-            self.venue_tree.insert("", "end", text=venue_id, values=(venue.name, venue.address, venue.contact, venue.min_guests, venue.max_guests))
+        # Venue records are inserted into the treeview by refresh_tab once they are loaded
+        # Filter the venues by ID or name prefix while the user types
+        self.search_filters["Venues"] = (self.venue_tree, self.venue_search_entry, Venue.search_venues)
+        self.venue_search_entry.bind("<KeyRelease>", lambda event: self.filter_tree("Venues"))
+        self.make_sortable("Venues")  # Sort the venues by clicking a column heading
         
         # Button to delete venue
         delete_venue_button = tk.Button(venue_tree_frame, text="Delete Venue", command=self.delete_venue)
@@ -816,9 +1203,10 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         # Get the venue ID from the entry field
         venue_id = self.venue_search_entry.get()
         if venue_id:
-            if venue_id in self.venues:
-                # If venue found, retrieve its details from the venues dictionary
-                venue = self.venues[venue_id]
+            # Look the venue up by ID first, then by address through the address index
+            venue = self.venues.get(venue_id) or Venue.find_by_address(venue_id)
+            if venue:
+                venue_id = venue.venue_id
                 # Display venue details in a message box
                 messagebox.showinfo("Venue found!",
                     f"Venue ID: {venue_id}\n"
@@ -852,10 +1240,8 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         try:
             # Create a new venue object
             new_venue = Venue(venue_id, name, address, contact, int(min_guests), int(max_guests))
-            # Add the new venue to the dictionary
-            self.venues[venue_id] = new_venue
-            # Save the updated venue data
-            Venue.save_venues(self.venues)
+            # Save the new venue (this also adds it to the dictionary)
+            Venue.put_venue(new_venue)
             # Show success message
             messagebox.showinfo("Success", "Venue details added successfully.")
             # Clear input fields
@@ -866,8 +1252,8 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
             self.venue_min_guests_entry.delete(0, tk.END)
             self.venue_max_guests_entry.delete(0, tk.END)
 
-            # Refresh venue records tree view
-            self.refresh_venue_tree()
+            # Refresh the row of this venue in the tree view
+            self.refresh_venue_tree(venue_id)
             
         except ValueError as ve:
             # Handle ValueError raised during object creation
@@ -891,30 +1277,32 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         # Ask for confirmation before deleting
         confirm = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete venue with ID: {venue_id}?")
         if confirm:
-            # If confirmed, delete the venue from the dictionary
-            del self.venues[venue_id]
-            # Save the updated venue data
-            Venue.save_venues(self.venues)
+            # If confirmed, delete the venue from the data file and the dictionary
+            Venue.delete_venue(venue_id)
             # Show success message
             messagebox.showinfo("Success", "Venue deleted successfully.")
 
-            # Refresh venue records tree view
-            self.refresh_venue_tree()
+            # Remove the row of this venue from the tree view
+            self.refresh_venue_tree(venue_id)
 
     # Define method to refresh the venue tree view
-    def refresh_venue_tree(self):
+    def refresh_venue_tree(self, venue_id=None):
+        # Only update the row of one venue when its ID is given
+        if venue_id is not None:
+            self.sync_tree_row(self.venue_tree, venue_id, self.venues.get(venue_id), self.venue_row)
+            return
         # Clear existing entries in the tree view
-        self.venue_tree.delete(*self.venue_tree.get_children())
-        # Insert updated venue records into the treeview
+        self.clear_tree(self.venue_tree)
+        # Insert updated venue records into the treeview (the venue ID is the item ID)
         for venue_id, venue in self.venues.items():
-            self.venue_tree.insert("", "end", text=venue_id, values=(venue.name, venue.address, venue.contact, venue.min_guests, venue.max_guests))
+            self.venue_tree.insert("", "end", iid=venue_id, text=venue_id, values=self.venue_row(venue))
 
-    # Define method to create the event tab
-    def create_event_tab(self):
-        # Create a frame for the event tab
-        event_tab = ttk.Frame(self.notebook)
-        self.notebook.add(event_tab, text="Events")
+    # Define method to get the tree view values of a venue
+    def venue_row(self, venue):
+        return (venue.name, venue.address, venue.contact, venue.min_guests, venue.max_guests)
 
+    # Define method to create the event tab
+    def create_event_tab(self, event_tab):
         # Add widgets for event management
         event_frame = ttk.LabelFrame(event_tab, text="Add / Modify Event")
         event_frame.pack(padx=10, pady=10, fill=tk.BOTH)
@@ -979,22 +1367,46 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         add_event_button = tk.Button(event_frame, text="Add / Modify Event", command=self.add_event)
         add_event_button.grid(row=8, columnspan=2, padx=5, pady=5)
 
+        # Button to check whether the venue is free at the entered date, time and duration
+        check_venue_button = tk.Button(event_frame, text="Check Venue", command=self.check_venue)
+        check_venue_button.grid(row=8, column=2, padx=5, pady=5)
+
+        # Button to list the suppliers free on the entered date (during the entered time and duration, if any)
+        free_suppliers_button = tk.Button(event_frame, text="Free Suppliers", command=self.show_free_suppliers)
+        free_suppliers_button.grid(row=8, column=3, padx=5, pady=5)
+
         # Add search bar for event ID
         search_event_frame = ttk.LabelFrame(event_tab, text="Search Event")
         search_event_frame.pack(padx=10, pady=10, fill=tk.BOTH)
 
-        tk.Label(search_event_frame, text="Search by ID:").pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Label(search_event_frame, text="Search by ID or theme:").pack(side=tk.LEFT, padx=5, pady=5)
         self.event_search_entry = tk.Entry(search_event_frame)
         self.event_search_entry.pack(side=tk.LEFT, padx=5, pady=5)
         search_event_button = tk.Button(search_event_frame, text="Search", command=self.search_event)
         search_event_button.pack(side=tk.LEFT, padx=5, pady=5)
 
+        # List the events taking place on a day, or from one day to another
+        tk.Label(search_event_frame, text="Events from (dd/mm/yyyy):").pack(side=tk.LEFT, padx=5, pady=5)
+        self.calendar_from_entry = tk.Entry(search_event_frame, width=12)
+        self.calendar_from_entry.pack(side=tk.LEFT, padx=5, pady=5)
+        tk.Label(search_event_frame, text="to:").pack(side=tk.LEFT, padx=5, pady=5)
+        self.calendar_to_entry = tk.Entry(search_event_frame, width=12)
+        self.calendar_to_entry.pack(side=tk.LEFT, padx=5, pady=5)
+        calendar_button = tk.Button(search_event_frame, text="Show Events", command=self.show_calendar)
+        calendar_button.pack(side=tk.LEFT, padx=5, pady=5)
+
         # Treeview for displaying event records
         event_tree_frame = ttk.LabelFrame(event_tab, text="Event Records")
         event_tree_frame.pack(padx=5, pady=5, fill=tk.BOTH)
 
-        self.event_tree = ttk.Treeview(event_tree_frame, columns=("Type", "Theme", "Date", "Time", "Duration", "Venue Address", "Client ID", "Guest List", "Catering Company", "Cleaning Company", "Decorations Company", "Entertainment Company", "Furniture Supply Company", "Invoice"), selectmode="browse", height=5)
-        self.event_tree.pack(fill="both")
+        # Only the events in view are inserted into the Treeview; the scrollbar covers all of them
+        event_tree_container = ttk.Frame(event_tree_frame)
+        event_tree_container.pack(fill="both")
+        self.event_tree = VirtualTreeview(event_tree_container, self.event_row, columns=("Type", "Theme", "Date", "Time", "Duration", "Venue Address", "Client ID", "Guests", "Catering Company", "Cleaning Company", "Decorations Company", "Entertainment Company", "Furniture Supply Company", "Invoice"), selectmode="browse", height=5)
+        self.event_tree.pack(side=tk.LEFT, fill="both", expand=True)
+        event_scrollbar = ttk.Scrollbar(event_tree_container, orient=tk.VERTICAL)
+        event_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.event_tree.attach_scrollbar(event_scrollbar)
         
         # Configure column headings
         self.event_tree.heading("#0", text="ID")
@@ -1005,7 +1417,7 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         self.event_tree.heading("Duration", text="Duration")
         self.event_tree.heading("Venue Address", text="Venue Address")
         self.event_tree.heading("Client ID", text="Client ID")
-        self.event_tree.heading("Guest List", text="Guest List")
+        self.event_tree.heading("Guests", text="Guests")  # Number of guests; the guests are listed below
         self.event_tree.heading("Catering Company", text="Catering Company")
         self.event_tree.heading("Cleaning Company", text="Cleaning Company")
         self.event_tree.heading("Decorations Company", text="Decorations Company")
@@ -1013,13 +1425,46 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         self.event_tree.heading("Furniture Supply Company", text="Furniture Supply Company")
         self.event_tree.heading("Invoice", text="Invoice")
 
-        # Insert event records into the treeview
-        for event_id, event in self.events.items():
-            self.event_tree.insert("", "end", text=event_id, values=(event.event_type, event.theme, event.date, event.time, event.duration, event.venue_address, event.client_id, event.guest_list, event.catering_company, event.cleaning_company, event.decorations_company, event.entertainment_company, event.furniture_supply_company, event.invoice))
+        # Event records are shown in the treeview by refresh_tab once they are loaded
+        # Filter the events by ID or theme prefix while the user types
+        self.search_filters["Events"] = (self.event_tree, self.event_search_entry, Event.search_events)
+        self.event_search_entry.bind("<KeyRelease>", lambda event: self.show_event_page(0))
+        self.make_sortable("Events")  # Sort the events by clicking a column heading
+
+        # Events are shown one page at a time, in the order of the sorted column
+        self.event_page = 0  # Index of the page shown
+        event_page_frame = ttk.Frame(event_tree_frame)
+        event_page_frame.pack(side=tk.LEFT, padx=5, pady=5)
+        self.event_previous_button = tk.Button(event_page_frame, text="< Previous", command=lambda: self.show_event_page(self.event_page - 1))
+        self.event_previous_button.pack(side=tk.LEFT, padx=5)
+        self.event_page_label = tk.Label(event_page_frame, text="")
+        self.event_page_label.pack(side=tk.LEFT, padx=5)
+        self.event_next_button = tk.Button(event_page_frame, text="Next >", command=lambda: self.show_event_page(self.event_page + 1))
+        self.event_next_button.pack(side=tk.LEFT, padx=5)
 
         # Button to delete event
         delete_event_button = tk.Button(event_tree_frame, text="Delete Event", command=self.delete_event)
         delete_event_button.pack(side=tk.RIGHT, padx=5, pady=5)
+
+        # Guests of the selected event, only looked up when an event is selected
+        event_guests_frame = ttk.LabelFrame(event_tab, text="Guests of Selected Event")
+        event_guests_frame.pack(padx=5, pady=5, fill=tk.BOTH, expand=True)
+        event_guests_container = ttk.Frame(event_guests_frame)
+        event_guests_container.pack(fill="both", expand=True)
+        self.event_guest_tree = VirtualTreeview(event_guests_container, self.event_guest_row, columns=("Name", "Address", "Contact Details"), selectmode="browse", height=5)
+        self.event_guest_tree.pack(side=tk.LEFT, fill="both", expand=True)
+        event_guests_scrollbar = ttk.Scrollbar(event_guests_container, orient=tk.VERTICAL)
+        event_guests_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.event_guest_tree.attach_scrollbar(event_guests_scrollbar)
+        self.event_guest_tree.heading("#0", text="Guest ID")
+        self.event_guest_tree.heading("Name", text="Name")
+        self.event_guest_tree.heading("Address", text="Address")
+        self.event_guest_tree.heading("Contact Details", text="Contact Details")
+        self.shown_event_id = None  # Event whose guests are listed
+        self.shown_guest_list = []  # Guest IDs of that event (a guest list may name a guest more than once)
+        self.event_tree.bind("<<TreeviewSelect>>", lambda event: self.show_event_guests(), add="+")
+
+        self.sort_tree("Events", self.default_sorting["Events"])  # Events are listed by date unless another column is chosen
          
                                  
     # Function to search for an event
@@ -1027,25 +1472,27 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
         # Get the event ID from the entry field
         event_id = self.event_search_entry.get()
         if event_id:
-            if event_id in self.events:
-                # If event found, retrieve its details from the events dictionary
-                event = self.events[event_id]
+            # If event found, get it joined with its client, venue and suppliers (cached until one of them changes)
+            resolved = ResolvedEventCache.get(event_id)
+            if resolved is not None:
+                event = resolved.event
+                details = resolved.get_details()
                 # Display event details in a message box
                 messagebox.showinfo("Event found!",
                     f"Event ID: {event_id}\n"
-                    f"Type: {event.event_type}\n"
+                    f"Type: {details['Type']}\n"
                     f"Theme: {event.theme}\n"
                     f"Date: {event.date}\n"
                     f"Time: {event.time}\n"
                     f"Duration: {event.duration}\n"
-                    f"Venue Address: {event.venue_address}\n"
-                    f"Client ID: {event.client_id}\n"
-                    f"Guest List: {event.guest_list}\n"
-                    f"Catering Company: {event.catering_company}\n"
-                    f"Cleaning Company: {event.cleaning_company}\n"
-                    f"Decorations Company: {event.decorations_company}\n"
-                    f"Entertainment Company: {event.entertainment_company}\n"
-                    f"Furniture Supply Company: {event.furniture_supply_company}\n"
+                    f"Venue: {details['Venue']} ({event.venue_address})\n"
+                    f"Client: {details['Client']} ({event.client_id})\n"
+                    f"Guests: {len(event.guest_list)}\n"
+                    f"Catering Company: {details['Catering Company']} ({event.catering_company})\n"
+                    f"Cleaning Company: {details['Cleaning Company']} ({event.cleaning_company})\n"
+                    f"Decorations Company: {details['Decorations Company']} ({event.decorations_company})\n"
+                    f"Entertainment Company: {details['Entertainment Company']} ({event.entertainment_company})\n"
+                    f"Furniture Supply Company: {details['Furniture Supply Company']} ({event.furniture_supply_company})\n"
                     f"Invoice: {event.invoice}")
             else:
                 # If event not found, display a message
@@ -1079,8 +1526,7 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
                 raise ValueError("Please fill in all fields.")
 
             # Create the event instance
-            self.events[event_id] = Event(event_id, event_type, theme, date, time, int(duration), venue_address, client_id, ast.literal_eval(guest_list), catering_company, cleaning_company, decorations_company, entertainment_company, furniture_supply_company, int(invoice))
-            Event.save_events(self.events)
+            Event.put_event(Event(event_id, event_type, theme, date, time, int(duration), venue_address, client_id, ast.literal_eval(guest_list), catering_company, cleaning_company, decorations_company, entertainment_company, furniture_supply_company, int(invoice)))
             messagebox.showinfo("Success", "Event details added successfully.")
             
             # Clear input fields
@@ -1099,8 +1545,8 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
             self.furniture_entry.delete(0, tk.END)
             self.invoice_entry.delete(0, tk.END)
 
-            # Refresh event records tree view
-            self.refresh_event_tree()
+            # Refresh the row of this event in the tree view
+            self.refresh_event_tree(event_id)
         
         except ValueError as ve:
             # Display error message in messagebox
@@ -1110,13 +1556,149 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
             # Display unexpected error in messagebox
             messagebox.showerror("Error", f"An unexpected error occurred: {e}")
 
+    # Function to check whether the entered venue is free for the entered date, time and duration
+    def check_venue(self):
+        event_id = self.event_id_entry.get()
+        date = self.date_entry.get()
+        time = self.time_entry.get()
+        duration = self.duration_entry.get()
+        venue_address = self.venue_entry.get()
+
+        try:
+            if not all([date, time, duration, venue_address]):
+                raise ValueError("Please fill in the date, time, duration and venue address.")
+            if not Venue.find_by_address(venue_address):
+                raise ValueError("Venue with address {} does not exist".format(venue_address))
+
+            # The event being modified does not conflict with itself
+            conflicts = Event.venue_conflicts(venue_address, date, time, int(duration), exclude=event_id or None)
+            if conflicts:
+                booked = "\n".join(f"{conflict_id}: {format_time(start)} to {format_time(end)}"
+                                    for start, end, conflict_id in conflicts)
+                messagebox.showwarning("Venue Booked", f"The venue is already booked by:\n{booked}")
+            else:
+                messagebox.showinfo("Venue Free", "The venue is free at that time.")
+
+        except ValueError as ve:
+            messagebox.showerror("Error", str(ve))
+
+    # Function to list the suppliers free on the entered date, or during the entered time and duration if given
+    def show_free_suppliers(self):
+        event_id = self.event_id_entry.get()
+        date = self.date_entry.get()
+        time = self.time_entry.get()
+        duration = self.duration_entry.get()
+
+        try:
+            if not date:
+                raise ValueError("Please fill in the date.")
+            if time and not duration:
+                raise ValueError("Please fill in the duration of the event.")
+            free = Event.free_suppliers(date, time or None, int(duration) if time else None, exclude=event_id or None)
+        except ValueError as ve:
+            messagebox.showerror("Error", str(ve))
+            return
+
+        # Reuse the window of the previous check
+        if self.free_suppliers_window is None or not self.free_suppliers_window.winfo_exists():
+            self.free_suppliers_window = tk.Toplevel(self)
+            self.free_suppliers_window.geometry("500x300")
+            self.free_suppliers_tree = ttk.Treeview(self.free_suppliers_window, columns=("Name",))
+            self.free_suppliers_tree.heading("#0", text="Supplier ID")
+            self.free_suppliers_tree.heading("Name", text="Name")
+            self.free_suppliers_tree.pack(fill="both", expand=True)
+        when = f"{date} {time} for {duration} hours" if time else date
+        self.free_suppliers_window.title(f"Suppliers free on {when}: {len(free)}")
+        self.free_suppliers_window.lift()
+
+        self.free_suppliers_tree.delete(*self.free_suppliers_tree.get_children())
+        suppliers = Supplier.load_suppliers()  # Shared with the Suppliers tab, which may still be loading
+        for supplier_id in sorted(free):
+            self.free_suppliers_tree.insert("", "end", text=supplier_id, values=(suppliers[supplier_id].name,))
+
+    # Function to list the events taking place on the entered day, or from the first to the second entered day
+    def show_calendar(self):
+        first_day = self.calendar_from_entry.get().strip()
+        last_day = self.calendar_to_entry.get().strip()
+
+        try:
+            if not first_day:
+                raise ValueError("Please fill in the date.")
+            if last_day:
+                events = Event.events_between(day_interval(first_day)[0], day_interval(last_day)[1])  # Up to the end of the last day
+            else:
+                events = Event.events_on(day_interval(first_day)[0])
+        except ValueError as ve:
+            messagebox.showerror("Error", str(ve))
+            return
+
+        # Reuse the window of the previous query
+        if self.calendar_window is None or not self.calendar_window.winfo_exists():
+            self.calendar_window = tk.Toplevel(self)
+            self.calendar_window.geometry("700x300")
+            self.calendar_tree = ttk.Treeview(self.calendar_window, columns=("Theme", "Date", "Time", "Duration", "Venue Address"))
+            self.calendar_tree.heading("#0", text="Event ID")
+            for column in ("Theme", "Date", "Time", "Duration", "Venue Address"):
+                self.calendar_tree.heading(column, text=column)
+            self.calendar_tree.pack(fill="both", expand=True)
+        when = f"{first_day} to {last_day}" if last_day else first_day
+        self.calendar_window.title(f"Events on {when}: {len(events)}")
+        self.calendar_window.lift()
+
+        # Events are listed in start order
+        self.calendar_tree.delete(*self.calendar_tree.get_children())
+        for event in events:
+            self.calendar_tree.insert("", "end", text=event.event_id, values=(event.theme, event.date, event.time, event.duration, event.venue_address))
+
     # Function to refresh event records tree view
-    def refresh_event_tree(self):
-        # Clear existing entries in the tree view
-        self.event_tree.delete(*self.event_tree.get_children())
-        # Insert updated event records into the treeview
-        for event_id, event in self.events.items():
-            self.event_tree.insert("", "end", text=event_id, values=(event.event_type, event.theme, event.date, event.time, event.duration, event.venue_address, event.client_id, event.guest_list, event.catering_company, event.cleaning_company, event.decorations_company, event.entertainment_company, event.furniture_supply_company, event.invoice))
+    def refresh_event_tree(self, event_id=None):
+        # Only the events of the current page are given to the tree view (which inserts the visible ones).
+        # A changed event may move to another place in the filtered and sorted order, so the page is
+        # always read again from the sort index.
+        self.filter_tree("Events")
+        if event_id is not None and event_id == self.shown_event_id:
+            self.shown_event_id = None  # List the guests of the modified event again
+            self.show_event_guests()
+
+    # Function to get the tree view row of an event
+    def event_row(self, event_id):
+        event = self.events[event_id]
+        return event_id, (event.event_type, event.theme, event.date, event.time, event.duration, event.venue_address, event.client_id, len(event.guest_list), event.catering_company, event.cleaning_company, event.decorations_company, event.entertainment_company, event.furniture_supply_company, event.invoice)
+
+    # Function to show a page of events (the page is clamped to the pages there are)
+    def show_event_page(self, page):
+        self.event_page = page
+        self.filter_tree("Events")
+
+    # Function to get the (start, stop) positions of the current page among a number of filtered and sorted events
+    def event_page_range(self, count):
+        pages = max(1, -(-count // self.event_page_size))
+        self.event_page = min(max(self.event_page, 0), pages - 1)
+        self.event_page_label.config(text=f"Page {self.event_page + 1} of {pages} ({count} events)")
+        self.event_previous_button.config(state=tk.NORMAL if self.event_page > 0 else tk.DISABLED)
+        self.event_next_button.config(state=tk.NORMAL if self.event_page < pages - 1 else tk.DISABLED)
+        start = self.event_page * self.event_page_size
+        return start, start + self.event_page_size
+
+    # Function to list the guests of the selected event (their details are only looked up for visible rows).
+    # The rows are keyed by position, as a guest list may name the same guest twice and item IDs must be unique.
+    def show_event_guests(self):
+        selection = self.event_tree.selection()
+        event_id = selection[0] if selection else None
+        if event_id == self.shown_event_id:
+            return  # Still the same event (the selection is restored while scrolling)
+        self.shown_event_id = event_id
+        event = self.events.get(event_id) if event_id is not None else None
+        self.shown_guest_list = list(event.guest_list) if event is not None else []
+        self.event_guest_tree.set_rows(str(position) for position in range(len(self.shown_guest_list)))
+
+    # Function to get the tree view row of a guest of the selected event from its position in the guest list
+    def event_guest_row(self, position):
+        guest_id = self.shown_guest_list[int(position)]
+        guest = self.guests.get(guest_id)
+        if guest is None:
+            return guest_id, ("(guest no longer exists)", "", "")
+        return guest_id, (guest.name, guest.address, guest.contact_details)
 
     # Function to delete an event
     def delete_event(self):
@@ -1125,20 +1707,26 @@ class EventManagementSystemGUI(tk.Tk):  # Subclass of tk.Tk for the main applica
             messagebox.showerror("Error", "Please select an event to delete.")
             return
 
-        event_id = self.event_tree.item(selected_item, "text")
+        event_id = selected_item[0]  # Item IDs are the event IDs (the row may be scrolled out of view)
         confirm = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete event with ID: {event_id}?")
         if confirm:
             try:
-                del self.events[event_id]
-                Event.save_events(self.events)
+                Event.delete_event(event_id)
                 messagebox.showinfo("Success", "Event deleted successfully.")
-                # Refresh event records tree view
-                self.refresh_event_tree()
+                # Remove the row of this event from the tree view
+                self.refresh_event_tree(event_id)
             except Exception as e:
                 # Handle deletion error
                 messagebox.showerror("Error", f"Failed to delete event: {e}")
 
 if __name__ == "__main__":
+    # Command line usage: python GUI.py [--storage MODE]
+    parser = argparse.ArgumentParser(description="Event Management System")
+    parser.add_argument("--storage", choices=RecordStore.modes,
+                        help="how records are stored (default: the EMS_STORAGE_MODE environment variable, or {})".format(RecordStore.mode))
+    arguments = parser.parse_args()
+    if arguments.storage:
+        RecordStore.set_mode(arguments.storage)  # Chosen before the GUI starts loading data
     # Create an instance of the EventManagementSystemGUI class
     app = EventManagementSystemGUI()
     # Run the application
@@ -5,11 +5,21 @@
 
 
 import pickle  # Import the pickle module for object serialization
+import sys  # Import sys module to intern repeated strings
+from collections.abc import ItemsView, MutableMapping, ValuesView  # Import the abstract classes giving GuestTable the dictionary interface
 from enum import Enum  # Import Enum class for creating enumerated constants
+from itertools import filterfalse  # Import filterfalse to find missing guest IDs in one pass
+
+from Record import SlottedRecord  # Import SlottedRecord for compact instances
+from Repository import Repository  # Import Repository for the shared in-memory records
+from Search import GlobalSearch, PrefixIndex, TextIndex  # Import the search indexes
 
 # Define Guest class to represent a guest instance
-class Guest:
+class Guest(SlottedRecord):
     data_file = "guests.pkl"  # File to store guest data
+    __slots__ = ("guest_id", "name", "address", "contact_details")  # Attributes stored without a per-instance __dict__
+    search_index = PrefixIndex("name")  # Prefix index over guest IDs and names, kept current by the Repository
+    text_index = TextIndex(("name", "address", "contact_details"))  # Words of the guests for the global search
 
     # Initialize guest attributes with input validation
     def __init__(self, guest_id, name, address, contact_details):
@@ -47,18 +57,185 @@ class Guest:
     # Class method to load guests from file
     @classmethod
     def load_guests(cls):
-        try:
-            with open(cls.data_file, "rb") as file:
-                return pickle.load(file)  # Load guests from file using pickle
-        except FileNotFoundError:
-            return {}  # Return an empty dictionary if file does not exist
+        return Repository.load(cls.data_file)  # Load guests once and share them across the application
+
+    # Class method to find the IDs of a guest list that are not registered guests
+    @classmethod
+    def find_missing_guests(cls, guest_ids, guests=None):
+        # Every guest ID must be a string (checked on the set of types instead of one ID at a time)
+        if not set(map(type, guest_ids)) <= {str} and not all(isinstance(guest_id, str) for guest_id in guest_ids):
+            raise ValueError("Each guest ID in the guest list must be a string")
+
+        if guests is None:
+            guests = cls.load_guests()  # Reuse the shared in-memory guests
+        # One membership pass run by filterfalse in C, keeping guest list order and reporting every missing ID once
+        return list(dict.fromkeys(filterfalse(guests.__contains__, guest_ids)))
 
     # Class method to save guests to file
     @classmethod
     def save_guests(cls, guests):
-        with open(cls.data_file, "wb") as file:
-            pickle.dump(guests, file)  # Save guests to file using pickle
-            
+        Repository.save(cls.data_file, guests)  # Save all guests to file using pickle
+
+    # Class method to get a single guest by ID, or None if it does not exist
+    @classmethod
+    def get_guest(cls, guest_id):
+        return Repository.get(cls.data_file, guest_id)  # Read only the requested guest when the backend allows it
+
+    # Class method to save a single guest without rewriting the whole file
+    @classmethod
+    def put_guest(cls, guest):
+        Repository.put(cls.data_file, guest.guest_id, guest)  # Store the guest (written in the background in the storage mode in use)
+
+    # Class method to delete a single guest without rewriting the whole file
+    @classmethod
+    def delete_guest(cls, guest_id):
+        Repository.delete(cls.data_file, guest_id)  # Delete it from storage (written in the background in the storage mode in use)
+
+    # Class method to find the IDs of the guests whose ID or name starts with a prefix (ignoring case)
+    @classmethod
+    def search_guests(cls, prefix):
+        cls.load_guests()  # Make sure the guests (and therefore the index) are current
+        return cls.search_index.search(prefix)
+
+
+# Define GuestTable class: a columnar container of guests keyed by guest ID.
+# Each attribute is kept in its own list (names and addresses interned), and Guest objects are only
+# created when a guest is accessed, so it behaves like the old dictionary of guests while using far
+# less memory and pickling four lists instead of one object per guest.
+# Like a dictionary it keeps the guests in insertion order: a deleted guest leaves an empty row (its
+# guest ID set to None) that is only removed when more than half of the rows are empty, or when pickled.
+class GuestTable(MutableMapping):
+    def __init__(self, guest_ids=(), names=(), addresses=(), contact_details=()):
+        self._guest_ids = list(guest_ids)  # Guest ID of every row (None for the rows of deleted guests)
+        self._names = [sys.intern(name) for name in names]  # Name of every row
+        self._addresses = [sys.intern(address) for address in addresses]  # Address of every row
+        self._contact_details = list(contact_details)  # Contact details of every row
+        self._rows = dict(zip(self._guest_ids, range(len(self._guest_ids))))  # Guest ID -> row
+
+    # Class method to build a table from a dictionary of Guest objects
+    @classmethod
+    def from_records(cls, guests):
+        values = list(guests.values())
+        return cls([guest.guest_id for guest in values], [guest.name for guest in values],
+                   [guest.address for guest in values], [guest.contact_details for guest in values])
+
+    # Class method to build a table from columns that are already interned (used by copy and unpickling)
+    @classmethod
+    def _from_columns(cls, guest_ids, names, addresses, contact_details):
+        table = cls.__new__(cls)
+        table._guest_ids = list(guest_ids)
+        table._names = list(names)
+        table._addresses = list(addresses)
+        table._contact_details = list(contact_details)
+        table._rows = dict(zip(table._guest_ids, range(len(table._guest_ids))))
+        return table
+
+    # Create the Guest object of a row (without repeating the validation done when it was added)
+    def _guest(self, row):
+        guest = Guest.__new__(Guest)
+        guest.guest_id = self._guest_ids[row]
+        guest.name = self._names[row]
+        guest.address = self._addresses[row]
+        guest.contact_details = self._contact_details[row]
+        return guest
+
+    # Get the rows of the guests, in insertion order
+    def _live_rows(self):
+        if len(self._rows) == len(self._guest_ids):
+            return range(len(self._guest_ids))  # No empty rows
+        return [row for row, guest_id in enumerate(self._guest_ids) if guest_id is not None]
+
+    # Get the four columns without the empty rows
+    def _columns(self):
+        columns = (self._guest_ids, self._names, self._addresses, self._contact_details)
+        if len(self._rows) == len(self._guest_ids):
+            return columns
+        rows = self._live_rows()
+        return tuple([column[row] for row in rows] for column in columns)
+
+    def __getitem__(self, guest_id):
+        return self._guest(self._rows[guest_id])
+
+    def __setitem__(self, guest_id, guest):
+        row = self._rows.get(guest_id)
+        if row is None:
+            # New guest: append a row to every column
+            self._rows[guest_id] = len(self._guest_ids)
+            self._guest_ids.append(guest_id)
+            self._names.append(sys.intern(guest.name))
+            self._addresses.append(sys.intern(guest.address))
+            self._contact_details.append(guest.contact_details)
+        else:
+            # Existing guest: overwrite its row
+            self._names[row] = sys.intern(guest.name)
+            self._addresses[row] = sys.intern(guest.address)
+            self._contact_details[row] = guest.contact_details
+
+    def __delitem__(self, guest_id):
+        row = self._rows.pop(guest_id)
+        # Empty the row instead of moving another guest into it, so the order of the other guests is kept
+        self._guest_ids[row] = None
+        self._names[row] = self._addresses[row] = self._contact_details[row] = None
+        if len(self._rows) * 2 < len(self._guest_ids):
+            # Mostly empty rows: drop them (the remaining guests keep their order)
+            self._guest_ids, self._names, self._addresses, self._contact_details = self._columns()
+            self._rows = dict(zip(self._guest_ids, range(len(self._guest_ids))))
+
+    def __contains__(self, guest_id):
+        return guest_id in self._rows
+
+    def __iter__(self):
+        if len(self._rows) == len(self._guest_ids):
+            return iter(self._guest_ids)
+        return (guest_id for guest_id in self._guest_ids if guest_id is not None)
+
+    def __len__(self):
+        return len(self._rows)
+
+    # Get a view of all guests, created one at a time while it is iterated (faster than looking every
+    # guest up by ID)
+    def values(self):
+        return GuestTableValues(self)
+
+    # Get the values of one attribute of all guests, in the order of the guest IDs (used by indexes to
+    # avoid creating guests)
+    def column(self, attribute):
+        position = ("guest_id", "name", "address", "contact_details").index(attribute)
+        return self._columns()[position]
+
+    # Get a view of all (guest ID, guest) pairs, created one at a time while it is iterated
+    def items(self):
+        return GuestTableItems(self)
+
+    # Get a copy that no longer changes together with this table
+    def copy(self):
+        return GuestTable._from_columns(*self._columns())
+
+    # Pickle the four columns (without empty rows) instead of one object per guest
+    def __reduce__(self):
+        return (GuestTable._from_columns, self._columns())
+
+
+# Define GuestTableValues class: the guests of a GuestTable, read row by row
+class GuestTableValues(ValuesView):
+    def __iter__(self):
+        table = self._mapping
+        return (table._guest(row) for row in table._live_rows())
+
+
+# Define GuestTableItems class: the (guest ID, guest) pairs of a GuestTable, read row by row
+class GuestTableItems(ItemsView):
+    def __iter__(self):
+        table = self._mapping
+        return ((table._guest_ids[row], table._guest(row)) for row in table._live_rows())
+
+
+# Keep the guests of the shared repository in a GuestTable
+Repository.set_container(Guest.data_file, GuestTable.from_records)
+# Keep the search index current through every load, save, put and delete of guests
+Repository.add_index(Guest.data_file, Guest.search_index)
+# Include the guests in the global search
+GlobalSearch.register(Guest)
 
 
 # In[ ]:
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import csv  # Import csv module to read CSV files row by row
+import json  # Import json module to read JSON Lines files
+import os  # Import os module to inspect file extensions
+import sys  # Import sys module for command line arguments
+
+#Import classes from other files
+from Client import Client
+from Guest import Guest
+from Supplier import Supplier
+from Venue import Venue
+
+# Define ImportResult class to report the outcome of an import
+class ImportResult:
+    max_errors = 1000  # Only the first errors are kept so memory stays bounded
+
+    def __init__(self):
+        self.imported = 0  # Number of rows imported
+        self.failed = 0  # Number of rows rejected
+        self.errors = []  # (line number, error message) of the first rejected rows
+
+    # Record a rejected row
+    def add_error(self, line_number, message):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line_number, message))
+
+    # Get a short summary for message boxes and the command line
+    def summary(self, max_lines=10):
+        lines = [f"Imported {self.imported} records, rejected {self.failed}."]
+        lines += [f"Line {line_number}: {message}" for line_number, message in self.errors[:max_lines]]
+        if self.failed > max_lines:
+            lines.append(f"... and {self.failed - max_lines} more errors")
+        return "\n".join(lines)
+
+
+# Define Importer class to bulk import records from CSV or JSON Lines files.
+# Rows are streamed one at a time, validated by the model constructor, and saved once at the end.
+class Importer:
+    # Model -> (constructor fields in order, converters for non-string fields, load method, save method)
+    specs = {
+        Guest: (("guest_id", "name", "address", "contact_details"), {},
+                Guest.load_guests, Guest.save_guests),
+        Client: (("client_id", "name", "address", "contact_details", "budget"), {"budget": float},
+                 Client.load_clients, Client.save_clients),
+        Supplier: (("supplier_id", "name", "address", "contact_details"), {},
+                   Supplier.load_suppliers, Supplier.save_suppliers),
+        Venue: (("venue_id", "name", "address", "contact", "min_guests", "max_guests"), {"min_guests": int, "max_guests": int},
+                Venue.load_venues, Venue.save_venues),
+    }
+
+    # Class method to read the rows of a CSV (with a header row) or JSON Lines file one at a time
+    @classmethod
+    def read_rows(cls, path):
+        # utf-8-sig drops the byte order mark spreadsheet programs put at the start of CSV files
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson"):
+                for line_number, line in enumerate(file, start=1):
+                    if line.strip():
+                        try:
+                            yield line_number, json.loads(line)
+                        except ValueError as e:
+                            yield line_number, e  # Reported as an error of this line
+            else:
+                reader = csv.DictReader(file)
+                for row in reader:
+                    yield reader.line_num, row
+
+    # Class method to import a file of records of a model (Guest, Client, Supplier or Venue)
+    @classmethod
+    def import_file(cls, path, model):
+        fields, converters, load, save = cls.specs[model]
+        result = ImportResult()
+        records = load().copy()  # Work on a copy so a failed import leaves the store untouched
+
+        for line_number, row in cls.read_rows(path):
+            try:
+                if not isinstance(row, dict):
+                    raise ValueError(f"Invalid row: {row}")
+                missing = [field for field in fields if row.get(field) in (None, "")]
+                if missing:
+                    raise ValueError("Missing {}".format(", ".join(missing)))
+                values = []
+                for field in fields:
+                    value = row[field]
+                    if field in converters and isinstance(value, str):
+                        try:
+                            value = converters[field](value.strip())
+                        except ValueError:
+                            raise ValueError(f"Invalid {field}: {value}")
+                    values.append(value)
+                record = model(*values)  # Validate the row with the model constructor
+            except ValueError as e:
+                result.add_error(line_number, str(e))
+                continue
+            records[values[0]] = record  # The first field is the record ID
+            result.imported += 1
+
+        if result.imported:
+            save(records)  # Commit all imported records with one write
+        return result
+
+
+if __name__ == "__main__":
+    # Command line usage: python Importer.py guests|clients|suppliers|venues FILE
+    models = {"guests": Guest, "clients": Client, "suppliers": Supplier, "venues": Venue}
+    if len(sys.argv) != 3 or sys.argv[1] not in models:
+        print("Usage: python Importer.py guests|clients|suppliers|venues FILE")
+        sys.exit(1)
+    print(Importer.import_file(sys.argv[2], models[sys.argv[1]]).summary())
+
+
+# In[ ]:
+
+
+
+
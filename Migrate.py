@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# One-shot migration of the existing .pkl data files into the SQLite database.
+# Run it once, then start the GUI with "python GUI.py --storage sqlite" (or with the environment
+# variable EMS_STORAGE_MODE=sqlite).
+
+from Storage import RecordStore  # Import RecordStore for the migration itself
+
+#Import classes from other files to get their data file names
+from Employee import Employee
+from Event import Event
+from Client import Client
+from Guest import Guest
+from Supplier import Supplier
+from Venue import Venue
+
+
+if __name__ == "__main__":
+    data_files = [Employee.data_file, Event.data_file, Client.data_file, Guest.data_file, Supplier.data_file, Venue.data_file]
+    counts = RecordStore.migrate_to_sqlite(data_files)  # Copy every store into its own table
+    for data_file, count in counts.items():
+        print(f"Migrated {count} records from {data_file} to table {RecordStore.table_name(data_file)}")
+    print(f"Start the GUI with \"python GUI.py --storage sqlite\" (or set EMS_STORAGE_MODE=sqlite) to use {RecordStore.database_file}")
+
+
+# In[ ]:
+
+
+
+
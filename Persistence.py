@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import atexit  # Import atexit module to flush pending writes when the program ends
+import queue  # Import queue module to hand batches of changes to the writer thread
+import threading  # Import threading module for the debounce timer, the writer thread and locks
+
+from Storage import RecordStore  # Import RecordStore for the actual writes
+
+# Define PersistenceScheduler class to coalesce rapid successive saves into one write per data file.
+# Changes are collected for `window` seconds after the first one and then handed, as one batch, to a
+# single writer thread that writes the batches in order, so callers (like the GUI) never wait for the disk.
+class PersistenceScheduler:
+    window = 0.5  # Seconds to wait for more changes before writing (0 hands them to the writer right away)
+
+    _pending_saves = {}  # Data file -> full record dictionary waiting to be saved
+    _pending_entries = {}  # Data file -> ("put", key, record) / ("delete", key) entries waiting to be written
+    _in_flight = {}  # Data file -> number of batches handed to the writer thread but not written yet
+    _timer = None  # Timer that hands the pending changes to the writer thread
+    _lock = threading.RLock()  # Guards the pending changes, the in-flight counts and the timer
+    _queue = queue.Queue()  # Batches of (saves, entries) waiting for the writer thread
+    _writer = None  # Thread writing the batches in order
+    _listeners = []  # Functions called with (data_file, error or None) after each write
+
+    # Class method to schedule a full save of all records of a data file
+    @classmethod
+    def schedule_save(cls, data_file, records):
+        with cls._lock:
+            # A full save supersedes every earlier change; the copy keeps later changes out of it
+            cls._pending_saves[data_file] = records.copy()
+            cls._pending_entries.pop(data_file, None)
+        cls._schedule()
+
+    # Class method to schedule the insertion or replacement of a single record
+    @classmethod
+    def schedule_put(cls, data_file, key, record):
+        with cls._lock:
+            cls._pending_entries.setdefault(data_file, []).append(("put", key, record))
+        cls._schedule()
+
+    # Class method to schedule the deletion of a single record
+    @classmethod
+    def schedule_delete(cls, data_file, key):
+        with cls._lock:
+            cls._pending_entries.setdefault(data_file, []).append(("delete", key))
+        cls._schedule()
+
+    # Class method to check whether a data file (or any data file) has changes that are not written yet
+    @classmethod
+    def has_pending(cls, data_file=None):
+        with cls._lock:
+            if data_file is None:
+                return bool(cls._pending_saves or cls._pending_entries or cls._in_flight)
+            return data_file in cls._pending_saves or data_file in cls._pending_entries or data_file in cls._in_flight
+
+    # Class method to register a function called with (data_file, error or None) after each write.
+    # It is called on the writer thread, so GUI code has to pass the result on to its own thread.
+    @classmethod
+    def add_listener(cls, listener):
+        cls._listeners.append(listener)
+
+    # Class method to start the timer that hands the pending changes to the writer thread
+    @classmethod
+    def _schedule(cls):
+        if cls.window <= 0:
+            cls._submit()
+            return
+        with cls._lock:
+            if cls._timer is None:
+                cls._timer = threading.Timer(cls.window, cls._submit)
+                cls._timer.daemon = True
+                cls._timer.start()
+
+    # Class method to hand every pending change to the writer thread as one batch
+    @classmethod
+    def _submit(cls):
+        with cls._lock:
+            if cls._timer is not None:
+                cls._timer.cancel()
+                cls._timer = None
+            if not cls._pending_saves and not cls._pending_entries:
+                return
+            saves, cls._pending_saves = cls._pending_saves, {}
+            entries, cls._pending_entries = cls._pending_entries, {}
+            for data_file in {**saves, **entries}:
+                cls._in_flight[data_file] = cls._in_flight.get(data_file, 0) + 1
+            if cls._writer is None:
+                cls._writer = threading.Thread(target=cls._write_batches, name="PersistenceWriter", daemon=True)
+                cls._writer.start()
+            cls._queue.put((saves, entries))
+
+    # Class method run by the writer thread: write the batches one after the other, in order
+    @classmethod
+    def _write_batches(cls):
+        while True:
+            saves, entries = cls._queue.get()
+            try:
+                # Full saves first, then the changes made after them
+                for data_file, records in saves.items():
+                    cls._write(data_file, RecordStore.save, records)
+                for data_file, data_file_entries in entries.items():
+                    cls._write(data_file, RecordStore.write_batch, data_file_entries)
+                with cls._lock:
+                    for data_file in {**saves, **entries}:
+                        cls._in_flight[data_file] -= 1
+                        if not cls._in_flight[data_file]:
+                            del cls._in_flight[data_file]
+            finally:
+                cls._queue.task_done()
+
+    # Class method to write the changes of one data file and report the outcome to the listeners
+    @classmethod
+    def _write(cls, data_file, write, changes):
+        error = None
+        try:
+            write(data_file, changes)
+        except Exception as e:
+            error = e
+            print(f"Error saving {data_file}: {e}")  # Print error message if saving fails
+        for listener in list(cls._listeners):
+            try:
+                listener(data_file, error)
+            except Exception as e:
+                print(f"Error reporting the save of {data_file}: {e}")
+
+    # Class method to write every pending change now and wait until it is on disk (also called on exit)
+    @classmethod
+    def flush(cls):
+        cls._submit()
+        if threading.current_thread() is not cls._writer:
+            cls._queue.join()  # Wait for this batch and every batch before it
+
+
+# Write anything still pending when the program ends
+atexit.register(PersistenceScheduler.flush)
+
+
+# In[ ]:
+
+
+
+
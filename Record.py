@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+# Define SlottedRecord class as the base of the model classes.
+# Subclasses list their attributes in __slots__, so instances have no per-instance __dict__.
+class SlottedRecord:
+    __slots__ = ()
+
+    # Get the attribute values of all slots (of the class and its bases) for pickling
+    def __getstate__(self):
+        state = {}
+        for klass in type(self).__mro__:
+            for name in getattr(klass, "__slots__", ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    # Restore the attributes from a pickle; pickles written before __slots__ hold the old
+    # instance __dict__, which has the same shape as the state returned by __getstate__
+    def __setstate__(self, state):
+        if isinstance(state, tuple):  # (__dict__, slots) state of the default slots protocol
+            dict_state, slot_state = state
+            state = dict(dict_state or {}, **(slot_state or {}))
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+# In[ ]:
+
+
+
+
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import threading  # Import threading module for locks
+
+from Persistence import PersistenceScheduler  # Import PersistenceScheduler to group writes together
+from Storage import RecordStore  # Import RecordStore for the actual file and database access
+
+# Define RecordIndex class as the base of secondary indexes kept current by the Repository
+class RecordIndex:
+    # Rebuild the index from all records of its data file (called whenever they are (re)loaded or saved)
+    def rebuild(self, records):
+        pass
+
+    # Add one record to the index
+    def add(self, key, record):
+        pass
+
+    # Remove one record from the index
+    def remove(self, key, record):
+        pass
+
+
+# Define LazyIndex class as the base of indexes built on their first query after a (re)load, so loading
+# stays fast and records of lazily loaded snapshots stay undecoded until an index is actually used.
+# Subclasses empty themselves in clear(), index all records in fill(), and skip single changes in
+# add() and remove() while is_pending() (those records are indexed by the next fill()).
+class LazyIndex(RecordIndex):
+    def __init__(self):
+        self.records = None  # Records to build the index from on the next query, or None when it is built
+        self.lock = threading.RLock()  # Guards the index (records are loaded on worker threads)
+
+    # Empty the index
+    def clear(self):
+        pass
+
+    # Index all records
+    def fill(self, records):
+        pass
+
+    # Keep the records for the next query instead of indexing them now
+    def rebuild(self, records):
+        with self.lock:
+            self.records = records
+            self.clear()
+
+    # Index the records kept by rebuild, if any (queries call this first)
+    def build(self):
+        with self.lock:
+            if self.records is None:
+                return
+            records, self.records = self.records, None
+            self.fill(records)
+
+    # Check whether the index is still waiting to be built (single changes are then already in self.records)
+    def is_pending(self):
+        return self.records is not None
+
+    # Get the (key, record) of every record. Lazily loaded snapshots lend their records without keeping
+    # them decoded.
+    @staticmethod
+    def record_items(records):
+        if hasattr(records, "peek"):
+            return ((key, records.peek(key)) for key in records)
+        return records.items()
+
+    # Get the (key, value) of one attribute of every record. Columnar containers (like GuestTable) hand out
+    # a whole column without creating records.
+    @classmethod
+    def attribute_values(cls, records, attribute):
+        if hasattr(records, "column"):
+            return zip(list(records), records.column(attribute))
+        return ((key, getattr(record, attribute, None)) for key, record in cls.record_items(records))
+
+    # Get the (key, tuple of attribute values) of every record, from the columns of columnar containers
+    @classmethod
+    def attribute_rows(cls, records, attributes):
+        if hasattr(records, "column"):
+            return zip(list(records), zip(*(records.column(attribute) for attribute in attributes)))
+        return ((key, tuple(getattr(record, attribute, None) for attribute in attributes)) for key, record in cls.record_items(records))
+
+
+# Define Repository class: a process-wide identity map of the loaded record dictionaries.
+# Every load_* class method and the GUI get the same dictionary object for a data file,
+# and it is only read again when the data file was changed by another process.
+# Changes are applied in memory right away and written by the PersistenceScheduler.
+class Repository:
+    _records = {}  # Loaded record dictionary of each data file
+    _indexes = {}  # Secondary indexes registered for each data file
+    _containers = {}  # Factory turning a loaded dictionary into the container used for a data file
+    _locks = {}  # One lock per data file so different stores can be loaded in parallel
+    _registry_lock = threading.Lock()  # Guards the lock dictionary
+
+    # Class method to get the lock of a data file
+    @classmethod
+    def _lock(cls, data_file):
+        with cls._registry_lock:
+            return cls._locks.setdefault(data_file, threading.RLock())
+
+    # Class method to get all records of a data file, reading them from storage only when needed
+    @classmethod
+    def load(cls, data_file):
+        with cls._lock(data_file):
+            if data_file not in cls._records or cls._is_stale(data_file):
+                if PersistenceScheduler.has_pending(data_file):
+                    PersistenceScheduler.flush()  # Storage has to catch up before it is read
+                cls._records[data_file] = cls._contain(data_file, RecordStore.load(data_file))
+                cls._rebuild_indexes(data_file)
+            return cls._records[data_file]
+
+    # Class method to choose another dictionary-like container for the records of a data file
+    @classmethod
+    def set_container(cls, data_file, factory):
+        cls._containers[data_file] = factory
+        RecordStore.set_container(data_file, factory)  # Compacted snapshots are written in it too
+
+    # Class method to put plain dictionaries of records into the container chosen for a data file
+    @classmethod
+    def _contain(cls, data_file, records):
+        factory = cls._containers.get(data_file)
+        if factory is not None and type(records) is dict:
+            return factory(records)
+        return records  # Already the right container (or a lazily loaded snapshot)
+
+    # Class method to register a secondary index that follows every change of a data file
+    @classmethod
+    def add_index(cls, data_file, index):
+        with cls._lock(data_file):
+            cls._indexes.setdefault(data_file, []).append(index)
+            if data_file in cls._records:
+                index.rebuild(cls._records[data_file])
+
+    # Class method to rebuild all indexes of a data file from its loaded records
+    @classmethod
+    def _rebuild_indexes(cls, data_file):
+        for index in cls._indexes.get(data_file, []):
+            index.rebuild(cls._records[data_file])
+
+    # Class method to check whether the stored data changed behind our back
+    # (never while our own changes are still waiting to be written)
+    @classmethod
+    def _is_stale(cls, data_file):
+        return not PersistenceScheduler.has_pending(data_file) and RecordStore.changed_externally(data_file)
+
+    # Class method to check whether the records of a data file are already in memory
+    @classmethod
+    def is_loaded(cls, data_file):
+        return data_file in cls._records
+
+    # Class method to replace all records of a data file
+    @classmethod
+    def save(cls, data_file, records):
+        with cls._lock(data_file):
+            records = cls._contain(data_file, records)
+            PersistenceScheduler.schedule_save(data_file, records)
+            cls._records[data_file] = records  # The saved records become the shared ones
+            cls._rebuild_indexes(data_file)
+
+    # Class method to get a single record, or None if it does not exist
+    @classmethod
+    def get(cls, data_file, key):
+        with cls._lock(data_file):
+            if data_file in cls._records and not cls._is_stale(data_file):
+                return cls._records[data_file].get(key)  # Served from memory
+        if PersistenceScheduler.has_pending(data_file):
+            PersistenceScheduler.flush()  # Storage has to catch up before a single record is read from it
+        return RecordStore.get(data_file, key)  # Read only this record from storage
+
+    # Class method to insert or replace a single record
+    @classmethod
+    def put(cls, data_file, key, record):
+        with cls._lock(data_file):
+            PersistenceScheduler.schedule_put(data_file, key, record)
+            if data_file in cls._records:
+                old_record = cls._records[data_file].get(key)
+                cls._records[data_file][key] = record  # Keep the shared dictionary current
+                for index in cls._indexes.get(data_file, []):
+                    if old_record is not None:
+                        index.remove(key, old_record)
+                    index.add(key, record)
+
+    # Class method to delete a single record
+    @classmethod
+    def delete(cls, data_file, key):
+        with cls._lock(data_file):
+            PersistenceScheduler.schedule_delete(data_file, key)
+            if data_file in cls._records:
+                old_record = cls._records[data_file].pop(key, None)  # Keep the shared dictionary current
+                if old_record is not None:
+                    for index in cls._indexes.get(data_file, []):
+                        index.remove(key, old_record)
+
+    # Class method to forget the loaded records of one data file (or of all of them)
+    @classmethod
+    def invalidate(cls, data_file=None):
+        if data_file is None:
+            cls._records.clear()
+        else:
+            cls._records.pop(data_file, None)
+
+
+# In[ ]:
+
+
+
+
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import ast  # Import ast module to read guest lists written as Python lists in CSV files
+import datetime  # Import datetime module to walk through the days of a date window
+import sys  # Import sys module for command line arguments
+from bisect import bisect_left  # Import bisect_left to skip the venues too small for a request
+
+#Import classes from other files
+from Booking import event_interval
+from Client import Client
+from Event import Event, EventType
+from Guest import Guest
+from Importer import Importer
+from Supplier import Supplier
+from Venue import Venue
+
+# Define EventRequest class: an event a client asks for on any day of a date window. The venue and the five
+# suppliers are left to the Scheduler.
+class EventRequest:
+    def __init__(self, event_id, event_type, theme, client_id, guest_list, first_date, last_date, time, duration, budget):
+        # Validate event ID
+        if not isinstance(event_id, str) or not event_id:
+            raise ValueError("Event ID must be a non-empty string")
+
+        # Validate event type
+        if event_type not in [event_type.value for event_type in EventType]:
+            raise ValueError("Event type must be one of {}".format(", ".join(event_type.value for event_type in EventType)))
+
+        # Validate guest list format
+        if not isinstance(guest_list, list):
+            raise ValueError("Guest list must be a list")
+        if not all(isinstance(guest_id, str) for guest_id in guest_list):
+            raise ValueError("Each guest ID in the guest list must be a string")
+
+        # Validate the date window (dd/mm/yyyy, first date not after the last)
+        try:
+            first_day = datetime.datetime.strptime(first_date, "%d/%m/%Y").date()
+            last_day = datetime.datetime.strptime(last_date, "%d/%m/%Y").date()
+        except (TypeError, ValueError):
+            raise ValueError("Date format should be dd/mm/yyyy")
+        if last_day < first_day:
+            raise ValueError("The last date must not be before the first date")
+
+        # Validate time format (should be hh:mm)
+        try:
+            datetime.datetime.strptime(time, "%H:%M")
+        except (TypeError, ValueError):
+            raise ValueError("Time format should be hh:mm")
+
+        # Validate duration (must be a positive integer)
+        if not isinstance(duration, int) or duration <= 0:
+            raise ValueError("Duration must be a positive integer")
+
+        # Validate budget (the invoice of the event, must be a positive number)
+        if not isinstance(budget, (int, float)) or budget <= 0:
+            raise ValueError("Budget must be a positive number")
+
+        # Set request attributes
+        self.event_id = event_id
+        self.event_type = event_type
+        self.theme = theme
+        self.client_id = client_id
+        self.guest_list = guest_list
+        self.time = time
+        self.duration = duration
+        self.budget = budget
+        # Days the event may take place on, earliest first
+        self.dates = [(first_day + datetime.timedelta(days=day)).strftime("%d/%m/%Y")
+                      for day in range((last_day - first_day).days + 1)]
+
+
+# Define ScheduleResult class to report the outcome of scheduling a batch of requests
+class ScheduleResult:
+    def __init__(self):
+        self.scheduled = []  # Events created for the scheduled requests
+        self.unscheduled = []  # (event ID or line number, reason) of the requests that could not be scheduled
+        self.guests = 0  # Number of guests of the scheduled events
+        self.capacity = 0  # Maximum number of guests of the venues booked for them
+
+    # Record a scheduled event and the venue booked for it
+    def add_event(self, event, venue):
+        self.scheduled.append(event)
+        self.guests += len(event.guest_list)
+        self.capacity += venue.max_guests
+
+    # Get the share of the booked venue capacity filled by guests (1.0 when every venue is full)
+    def utilization(self):
+        return self.guests / self.capacity if self.capacity else 0.0
+
+    # Get a short summary for message boxes and the command line
+    def summary(self, max_lines=10):
+        lines = [f"Scheduled {len(self.scheduled)} events, could not schedule {len(self.unscheduled)}."]
+        if self.scheduled:
+            lines.append(f"Venue capacity used: {self.utilization():.0%}")
+        lines += [f"{request}: {reason}" for request, reason in self.unscheduled[:max_lines]]
+        if len(self.unscheduled) > max_lines:
+            lines.append(f"... and {len(self.unscheduled) - max_lines} more")
+        return "\n".join(lines)
+
+
+# Define Scheduler class to assign a venue, a day and five suppliers to each of a batch of event requests.
+# Every request gets the smallest venue that fits its guests, so the large venues stay free for large events,
+# on the earliest day of its window that venue is free. Requests with the fewest fitting venues and days are
+# placed first, as they are the easiest to leave without a slot. Suppliers are taken in turn from the list of
+# all suppliers, so the bookings spread evenly. Each placed event is saved right away, which keeps the venue and
+# supplier booking indexes current, so later requests of the batch never conflict with it.
+class Scheduler:
+    # Fields of a request row in order, and converters for the fields that are not strings
+    fields = ("event_id", "event_type", "theme", "client_id", "guest_list", "first_date", "last_date", "time", "duration", "budget")
+    converters = {"guest_list": ast.literal_eval, "duration": int, "budget": float}
+
+    # Class method to schedule a batch of EventRequests, returning a ScheduleResult
+    @classmethod
+    def schedule(cls, requests):
+        result = ScheduleResult()
+        venues = sorted(Venue.load_venues().values(), key=lambda venue: (venue.max_guests, venue.min_guests, venue.venue_id))
+        capacities = [venue.max_guests for venue in venues]  # Same order as venues, for binary search
+        supplier_ids = sorted(Supplier.load_suppliers())
+        clients = Client.load_clients()
+        events = Event.load_events()  # Loaded, so saving an event updates the booking indexes
+        next_supplier = 0  # Position in supplier_ids of the next supplier to offer
+
+        # The venues whose capacity bounds fit the guests of a request, smallest first
+        def fitting_venues(request):
+            guests = len(request.guest_list)
+            return [venue for venue in venues[bisect_left(capacities, guests):] if venue.min_guests <= guests]
+
+        candidates = [(fitting_venues(request), request) for request in requests]
+        candidates.sort(key=lambda candidate: (len(candidate[0]) * len(candidate[1].dates), -len(candidate[1].guest_list)))
+
+        for request_venues, request in candidates:
+            # Reject the requests no slot could make valid before searching for one
+            client = clients.get(request.client_id)
+            missing_guests = Guest.find_missing_guests(request.guest_list)
+            if request.event_id in events:
+                reason = "Event ID already exists"
+            elif not client:
+                reason = "Client does not exist"
+            elif not request.budget < client.budget:
+                reason = "Budget exceeds the client's budget"
+            elif missing_guests:
+                reason = "Guests with IDs {} do not exist".format(", ".join(missing_guests))
+            elif not request_venues:
+                reason = f"No venue fits {len(request.guest_list)} guests"
+            elif len(supplier_ids) < 5:
+                reason = "Fewer than five suppliers exist"
+            else:
+                reason = f"No venue and five suppliers are free from {request.dates[0]} to {request.dates[-1]}"
+                slot = cls.find_slot(request, request_venues, supplier_ids, next_supplier)
+                if slot is not None:
+                    venue, date, suppliers, next_supplier = slot
+                    try:
+                        # The event validates the slot once more, like one added through the event form
+                        event = Event(request.event_id, request.event_type, request.theme, date, request.time, request.duration,
+                                      venue.address, request.client_id, request.guest_list, *suppliers, request.budget)
+                    except ValueError as e:
+                        reason = str(e)
+                    else:
+                        Event.put_event(event)
+                        result.add_event(event, venue)
+                        continue
+            result.unscheduled.append((request.event_id, reason))
+        return result
+
+    # Class method to find the first (venue, date, five supplier IDs, next supplier position) free for a request,
+    # trying the venues in order and the days of the window earliest first, or None if there is none
+    @classmethod
+    def find_slot(cls, request, venues, supplier_ids, next_supplier):
+        for venue in venues:
+            venue_key = Venue.address_index.normalize(venue.address)
+            for date in request.dates:
+                start, end = event_interval(date, request.time, request.duration)
+                if not Event.venue_bookings.is_free(venue_key, start, end):
+                    continue
+                # Take the next five suppliers free at that time, going round the list once at most
+                suppliers = []
+                for offset in range(len(supplier_ids)):
+                    position = (next_supplier + offset) % len(supplier_ids)
+                    if Event.supplier_bookings.is_free(supplier_ids[position], start, end):
+                        suppliers.append(supplier_ids[position])
+                        if len(suppliers) == 5:
+                            return venue, date, suppliers, (position + 1) % len(supplier_ids)
+        return None
+
+    # Class method to read requests from a CSV (with a header row) or JSON Lines file and schedule them.
+    # Rows that are not valid requests are reported as unscheduled by line number.
+    @classmethod
+    def schedule_file(cls, path):
+        requests = []
+        errors = []
+        for line_number, row in Importer.read_rows(path):
+            try:
+                if not isinstance(row, dict):
+                    raise ValueError(f"Invalid row: {row}")
+                missing = [field for field in cls.fields if row.get(field) in (None, "")]
+                if missing:
+                    raise ValueError("Missing {}".format(", ".join(missing)))
+                values = []
+                for field in cls.fields:
+                    value = row[field]
+                    if field in cls.converters and isinstance(value, str):
+                        try:
+                            value = cls.converters[field](value.strip())
+                        except (SyntaxError, ValueError):
+                            raise ValueError(f"Invalid {field}: {value}")
+                    values.append(value)
+                requests.append(EventRequest(*values))
+            except ValueError as e:
+                errors.append((f"Line {line_number}", str(e)))
+        result = cls.schedule(requests)
+        result.unscheduled[:0] = errors
+        return result
+
+
+if __name__ == "__main__":
+    # Command line usage: python Scheduler.py FILE
+    if len(sys.argv) != 2:
+        print("Usage: python Scheduler.py FILE")
+        sys.exit(1)
+    print(Scheduler.schedule_file(sys.argv[1]).summary())
+
+
+# In[ ]:
+
+
+
+
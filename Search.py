@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import heapq  # Import heapq module to pick the best ranked results
+import math  # Import math module for the rarity weight of search words
+import re  # Import re module to split text into words
+from bisect import bisect_left, bisect_right  # Import bisect functions for binary search in the sorted terms
+
+from Repository import Repository, LazyIndex  # Import Repository so it keeps the indexes current
+
+# Define PrefixIndex class for search-as-you-type: the ID and one text attribute (like the name) of every
+# record are kept as a sorted list of terms, so the records whose ID or name starts with a prefix are
+# found with two binary searches instead of a scan over all records.
+class PrefixIndex(LazyIndex):
+    def __init__(self, attribute="name"):
+        super().__init__()
+        self.attribute = attribute  # Attribute indexed together with the record ID
+        self.terms = []  # Sorted, case-folded terms
+        self.keys = []  # Record ID of each term (same positions as self.terms)
+
+    # Normalize a term for matching that ignores case and surrounding whitespace
+    def normalize(self, text):
+        return str(text).strip().casefold()
+
+    # Get the terms under which a record is found
+    def record_terms(self, key, record):
+        terms = {self.normalize(key)}
+        value = getattr(record, self.attribute, None)
+        if value:
+            terms.add(self.normalize(value))
+        return terms
+
+    # Empty the index
+    def clear(self):
+        self.terms = []
+        self.keys = []
+
+    # Sort the terms of all records
+    def fill(self, records):
+        terms = []
+        keys = []
+        for key, value in self.attribute_values(records, self.attribute):
+            term = self.normalize(key)
+            terms.append(term)
+            keys.append(key)
+            if value and self.normalize(value) != term:  # Same terms as record_terms
+                terms.append(self.normalize(value))
+                keys.append(key)
+        order = sorted(range(len(terms)), key=terms.__getitem__)  # Faster than sorting (term, key) tuples
+        self.terms = [terms[position] for position in order]
+        self.keys = [keys[position] for position in order]
+
+    # Add one record to the index
+    def add(self, key, record):
+        with self.lock:
+            if self.is_pending():
+                return  # The record is already in the records the index will be built from
+            for term in self.record_terms(key, record):
+                position = bisect_right(self.terms, term)
+                self.terms.insert(position, term)
+                self.keys.insert(position, key)
+
+    # Remove one record from the index
+    def remove(self, key, record):
+        with self.lock:
+            if self.is_pending():
+                return
+            for term in self.record_terms(key, record):
+                position = bisect_left(self.terms, term)
+                while position < len(self.terms) and self.terms[position] == term:
+                    if self.keys[position] == key:
+                        del self.terms[position]
+                        del self.keys[position]
+                        break
+                    position += 1
+
+    # Get the IDs of the records whose ID or indexed attribute starts with a prefix, in term order
+    def search(self, prefix):
+        prefix = self.normalize(prefix)
+        with self.lock:
+            self.build()
+            start = bisect_left(self.terms, prefix)
+            end = bisect_left(self.terms, prefix + "\U0010ffff", start)
+            return list(dict.fromkeys(self.keys[start:end]))  # A record matching by ID and name is listed once
+
+
+# Define TextIndex class: an inverted index from every word of some text attributes to the IDs of the
+# records containing it, so records mentioning a name, an address or a phone number are found without
+# reading every record. Like PrefixIndex, it is only built on the first search after a (re)load.
+class TextIndex(LazyIndex):
+    word_pattern = re.compile(r"\w+")  # Words are runs of letters and digits
+    common_size = 1000  # Words found in more records than this are not scanned in full by search()
+
+    def __init__(self, attributes):
+        super().__init__()
+        self.attributes = attributes  # Text attributes indexed (the record ID is always indexed)
+        self.postings = {}  # Word -> set of IDs of the records containing it
+        self.count = 0  # Number of indexed records
+
+    # Split a text into case-folded words
+    def words(self, text):
+        return self.word_pattern.findall(str(text).casefold())
+
+    # Get the distinct words of a record
+    def record_words(self, key, record):
+        return self.value_words(key, (getattr(record, attribute, None) for attribute in self.attributes))
+
+    # Get the distinct words of a record ID and the values of its indexed attributes
+    def value_words(self, key, values):
+        words = set(self.words(key))
+        for value in values:
+            if value is not None:
+                words.update(self.words(value))
+        return words
+
+    # Empty the index
+    def clear(self):
+        self.postings = {}
+        self.count = 0
+
+    # Index the words of all records (read by attribute, so columnar containers create no records)
+    def fill(self, records):
+        for key, values in self.attribute_rows(records, self.attributes):
+            for word in self.value_words(key, values):
+                self.postings.setdefault(word, set()).add(key)
+            self.count += 1
+
+    # Add one record to the index
+    def add(self, key, record):
+        with self.lock:
+            if self.is_pending():
+                return  # The record is already in the records the index will be built from
+            for word in self.record_words(key, record):
+                self.postings.setdefault(word, set()).add(key)
+            self.count += 1
+
+    # Remove one record from the index
+    def remove(self, key, record):
+        with self.lock:
+            if self.is_pending():
+                return
+            for word in self.record_words(key, record):
+                keys = self.postings.get(word)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self.postings[word]  # Drop words no record contains any more
+            self.count -= 1
+
+    # Get {record ID: (number of query words matched, score)} of the best records containing query words.
+    # Rare words weigh more than common ones, so a street name outranks a word like "hall". Words found in
+    # more than common_size records are not scanned in full: they only add to the records found through
+    # rarer words, plus at most `limit` other records (those containing the most common words first).
+    def search(self, words, limit=50):
+        with self.lock:
+            self.build()
+            postings = sorted(((self.postings[word], math.log(1 + self.count / len(self.postings[word])))
+                               for word in set(words) if word in self.postings), key=lambda posting: len(posting[0]))
+            rare = [posting for posting in postings if len(posting[0]) <= self.common_size]
+            common = postings[len(rare):]
+
+            matches = {}
+            for keys, weight in rare:
+                for key in keys:
+                    matched, score = matches.get(key, (0, 0.0))
+                    matches[key] = (matched + 1, score + weight)
+            for key, (matched, score) in matches.items():
+                for keys, weight in common:
+                    if key in keys:
+                        matched, score = matched + 1, score + weight
+                matches[key] = (matched, score)
+
+            # Other records can at best contain every common word; they are only needed when fewer than
+            # `limit` records found so far rank at least as high
+            best_other = (len(common), sum(weight for keys, weight in common))
+            if common and sum(1 for match in matches.values() if match >= best_other) < limit:
+                # Records containing every common word, then records containing any of them
+                candidates = [keys for keys, weight in common]
+                if len(common) > 1:
+                    candidates.insert(0, set.intersection(*candidates))
+                extra = 0
+                for keys in candidates:
+                    for key in keys:
+                        if extra >= limit:
+                            break
+                        if key not in matches:
+                            found = [weight for common_keys, weight in common if key in common_keys]
+                            matches[key] = (len(found), sum(found))
+                            extra += 1
+            return matches
+
+
+# Define GlobalSearch class to search the text indexes of every registered model at once
+class GlobalSearch:
+    models = []  # Registered model classes (each has a data_file and a text_index)
+
+    # Class method to include a model in the global search and keep its text index current
+    @classmethod
+    def register(cls, model):
+        cls.models.append(model)
+        Repository.add_index(model.data_file, model.text_index)
+
+    # Class method to get the best matches for a query as (model name, record ID, record) tuples, best first.
+    # Records containing more of the query words come first, then records with rarer words.
+    @classmethod
+    def search(cls, query, limit=50):
+        results = []
+        for model in cls.models:
+            words = model.text_index.words(query)
+            if not words:
+                return []
+            records = Repository.load(model.data_file) or {}  # Make sure the records (and the index) are current
+            for key, (matched, score) in model.text_index.search(words, limit).items():
+                results.append((matched, score, model.__name__, key, records))
+        best = heapq.nlargest(limit, results, key=lambda result: (result[0], result[1]))
+        return [(name, key, records[key]) for matched, score, name, key, records in best if key in records]
+
+
+# In[ ]:
+
+
+
+
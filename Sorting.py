@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import threading  # Import threading module to guard the registry of sort indexes
+from bisect import bisect_left, insort  # Import bisect functions to keep the entries sorted
+
+from Repository import Repository, LazyIndex  # Import Repository so it keeps the indexes current
+
+# Convert a "dd/mm/yyyy" date to a (year, month, day) tuple that sorts in date order
+def day_month_year(date):
+    day, month, year = date.split("/")
+    return int(year), int(month), int(day)
+
+
+# Define SortIndex class: the records of a data file sorted by one attribute, kept as a sorted list of
+# (sort value, record ID) entries. Tree views are sorted by reading the IDs in order instead of sorting
+# all rows (or the Tk items) on every click, and changes move a single entry.
+class SortIndex(LazyIndex):
+    _indexes = {}  # (data file, attribute) -> SortIndex
+    _registry_lock = threading.Lock()  # Guards the index dictionary
+    sort_cutoff = 16  # sort_keys sorts the keys it is given when they are fewer than 1/sort_cutoff of all records
+
+    def __init__(self, attribute, convert=None):
+        super().__init__()
+        self.attribute = attribute  # Attribute the records are sorted by
+        self.convert = convert  # Function turning an attribute value into the value to sort by, or None
+        self.entries = []  # Sorted (sort value, record ID) entries
+        self.source = {}  # All records, to look up the values of the keys given to sort_keys
+
+    # Class method to get the sort index of an attribute of a data file, creating and registering it on first use
+    @classmethod
+    def of(cls, data_file, attribute, convert=None):
+        with cls._registry_lock:
+            index = cls._indexes.get((data_file, attribute))
+            if index is None:
+                index = cls._indexes[(data_file, attribute)] = cls(attribute, convert)
+                Repository.add_index(data_file, index)  # Also passes the records if they are loaded
+        return index
+
+    # Get the value a record is sorted by. Numbers sort before text and missing values last, so records
+    # with values of different types can still be compared.
+    def sort_value(self, value):
+        if value is not None and self.convert is not None:
+            try:
+                value = self.convert(value)
+            except (TypeError, ValueError):
+                value = None
+        if value is None:
+            return (2, "")
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return (0, value)
+        if isinstance(value, tuple):
+            return (0,) + value
+        return (1, str(value).casefold())
+
+    # Keep the records for the next use, and for looking up values in sort_keys
+    def rebuild(self, records):
+        with self.lock:
+            super().rebuild(records)
+            self.source = records  # The shared records, which the Repository keeps current
+
+    # Empty the index
+    def clear(self):
+        self.entries = []
+
+    # Sort all records
+    def fill(self, records):
+        self.entries = sorted((self.sort_value(value), key) for key, value in self.attribute_values(records, self.attribute))
+
+    # Add one record to the index
+    def add(self, key, record):
+        with self.lock:
+            if not self.is_pending():
+                insort(self.entries, (self.sort_value(getattr(record, self.attribute, None)), key))
+
+    # Remove one record from the index
+    def remove(self, key, record):
+        with self.lock:
+            if not self.is_pending():
+                entry = (self.sort_value(getattr(record, self.attribute, None)), key)
+                position = bisect_left(self.entries, entry)
+                if position < len(self.entries) and self.entries[position] == entry:
+                    del self.entries[position]
+
+    # Get the number of indexed records
+    def count(self):
+        with self.lock:
+            self.build()
+            return len(self.entries)
+
+    # Get the IDs of the records in sorted order (largest first when descending), or only positions
+    # start to stop of that order (like one page of a tree view)
+    def ordered(self, descending=False, start=0, stop=None):
+        with self.lock:
+            self.build()
+            count = len(self.entries)
+            stop = count if stop is None else min(stop, count)
+            if descending:
+                keys = [key for value, key in self.entries[max(count - stop, 0):max(count - start, 0)]]
+                keys.reverse()
+            else:
+                keys = [key for value, key in self.entries[start:stop]]
+        return keys
+
+    # Get some record IDs (like the matches of a search) in sorted order, without copying all IDs. A few
+    # keys are sorted by their own values; many are picked from the sorted entries in one pass instead.
+    def sort_keys(self, keys, descending=False):
+        with self.lock:
+            self.build()
+            if len(keys) * self.sort_cutoff < len(self.entries):
+                records = self.source
+                lookup = records.peek if hasattr(records, "peek") else records.__getitem__  # Leave lazy records undecoded
+                entries = sorted((self.sort_value(getattr(lookup(key), self.attribute, None)), key) for key in keys if key in records)
+                keys = [key for value, key in entries]
+            else:
+                wanted = set(keys)
+                keys = [key for value, key in self.entries if key in wanted]
+        if descending:
+            keys.reverse()
+        return keys
+
+
+# In[ ]:
+
+
+
+
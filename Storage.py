@@ -0,0 +1,566 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import mmap  # Import mmap module to map indexed snapshots into memory
+import os  # Import os module for atomic file replacement and existence checks
+import pickle  # Import the pickle module for object serialization
+import sqlite3  # Import sqlite3 module for the embedded database backend
+import struct  # Import struct module for the footer of indexed snapshots
+import threading  # Import threading module for locks and background compaction
+import weakref  # Import weakref module to track the open snapshot mappings without keeping them alive
+from array import array  # Import array for the compact record offset table
+from collections.abc import MutableMapping  # Import MutableMapping to give LazyRecordMap the dictionary interface
+
+# Indexed snapshot layout: MAGIC, every record pickled on its own, the pickled (keys, offsets)
+# index, and finally the position of that index as an 8-byte unsigned integer
+INDEXED_MAGIC = b"EMSIDX1\n"
+INDEXED_FOOTER = struct.Struct("<Q")
+
+# Read the (keys, offsets) index of an indexed snapshot held in a buffer (like a memory map)
+def read_snapshot_index(data):
+    index_offset = INDEXED_FOOTER.unpack_from(data, len(data) - INDEXED_FOOTER.size)[0]
+    return pickle.loads(data[index_offset:len(data) - INDEXED_FOOTER.size])
+
+
+# Define MappedSnapshot class: the memory map of an indexed snapshot file, shared by the LazyRecordMaps
+# read from it. Windows does not allow replacing a file that is mapped, so replace() closes the maps of
+# a file around replacing it and then maps the new file, which holds the same bytes for every record
+# that was not changed since.
+class MappedSnapshot:
+    _open = {}  # Path -> MappedSnapshots currently mapping that file
+    _registry_lock = threading.Lock()  # Guards the dictionary above
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.RLock()  # Guards the memory map while it is swapped for the one of a new file
+        self.maps = weakref.WeakValueDictionary()  # id -> LazyRecordMap reading its records from this snapshot
+        self._mmap = None
+        self.offsets = None  # Start of every record, followed by the end of the last one
+
+    # Map the file and read its index, returning its keys in file order
+    def open(self):
+        with open(self.path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)  # The mapping stays valid after closing the file
+        keys, self.offsets = read_snapshot_index(self._mmap)
+        with self._registry_lock:
+            self._open.setdefault(self.path, weakref.WeakSet()).add(self)
+        return keys
+
+    # Unmap the file
+    def close(self):
+        with self._registry_lock:
+            self._open.get(self.path, set()).discard(self)
+        self._mmap.close()
+
+    # Get the pickled bytes of the record at a position of the index
+    def raw(self, position):
+        with self.lock:
+            return self._mmap[self.offsets[position]:self.offsets[position + 1]]
+
+    # Class method to replace a file with another one (atomically, like os.replace), moving every
+    # LazyRecordMap reading from the old file over to the new one. Records the new file does not hold
+    # are decoded first.
+    @classmethod
+    def replace(cls, source, path):
+        with cls._registry_lock:
+            snapshots = list(cls._open.get(path, ()))
+        if not snapshots:
+            os.replace(source, path)
+            return
+
+        with open(source, "rb") as file:
+            is_indexed = file.read(len(INDEXED_MAGIC)) == INDEXED_MAGIC
+        new_positions = {}  # Key -> position in the new file
+        if is_indexed:
+            with open(source, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                keys = read_snapshot_index(data)[0]
+            new_positions = dict(zip(keys, range(len(keys))))
+
+        for snapshot in snapshots:
+            snapshot.lock.acquire()
+        try:
+            for snapshot in snapshots:
+                for records in list(snapshot.maps.values()):
+                    records._keep_missing(new_positions)
+                snapshot.close()
+            try:
+                os.replace(source, path)
+            except OSError:
+                for snapshot in snapshots:
+                    snapshot.open()  # Map the old file again
+                raise
+            for snapshot in snapshots:
+                if is_indexed:
+                    snapshot.open()
+                for records in list(snapshot.maps.values()):
+                    records._move_positions(new_positions)  # All records are decoded when the new file is not indexed
+        finally:
+            for snapshot in snapshots:
+                snapshot.lock.release()
+
+
+# Define LazyRecordMap class: the records of a memory-mapped indexed snapshot.
+# Only the keys are read when it is opened; a record is unpickled the first time it is accessed.
+class LazyRecordMap(MutableMapping):
+    def __init__(self, path):
+        self._snapshot = MappedSnapshot(path)  # Memory map of the snapshot file (moved along when the file is replaced)
+        keys = self._snapshot.open()
+        self._positions = dict(zip(keys, range(len(keys))))  # Key -> position in the snapshot (None for new keys)
+        self._records = {}  # Records decoded so far, plus records added or replaced since opening
+        self._snapshot.maps[id(self)] = self
+
+    # Get the pickled bytes of a record that is still exactly as stored in the snapshot, or None
+    def raw(self, key):
+        with self._snapshot.lock:  # The position changes when the snapshot file is replaced
+            position = self._positions[key]
+            if position is None or key in self._records:
+                return None
+            return self._snapshot.raw(position)
+
+    # Decode the records still read from the snapshot that a new snapshot does not hold (called by
+    # MappedSnapshot.replace before the old file is unmapped)
+    def _keep_missing(self, new_positions):
+        for key, position in self._positions.items():
+            if position is not None and key not in self._records and key not in new_positions:
+                self._records[key] = pickle.loads(self._snapshot.raw(position))
+
+    # Point the records still read from the snapshot at their positions in the new snapshot
+    def _move_positions(self, new_positions):
+        for key, position in self._positions.items():
+            if position is not None:
+                self._positions[key] = new_positions.get(key)
+
+    def __getitem__(self, key):
+        try:
+            return self._records[key]
+        except KeyError:
+            pass
+        record = pickle.loads(self.raw(key))  # Raises KeyError for unknown keys
+        self._records[key] = record
+        return record
+
+    # Get a record without keeping it decoded, so indexes can be built over every record while
+    # the snapshot stays undecoded
+    def peek(self, key):
+        if key in self._records:
+            return self._records[key]
+        return pickle.loads(self.raw(key))  # Raises KeyError for unknown keys
+
+    def __setitem__(self, key, record):
+        if key not in self._positions:
+            self._positions[key] = None  # New keys come after the snapshot keys
+        self._records[key] = record
+
+    def __delitem__(self, key):
+        del self._positions[key]
+        self._records.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._positions  # Membership never decodes a record
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+    # Get a shallow copy that shares the memory-mapped snapshot
+    def copy(self):
+        clone = LazyRecordMap.__new__(LazyRecordMap)
+        clone._snapshot = self._snapshot
+        clone._positions = dict(self._positions)
+        clone._records = dict(self._records)
+        self._snapshot.maps[id(clone)] = clone
+        return clone
+
+    # Pickle as a plain dictionary (for example when saving in another storage mode)
+    def __reduce__(self):
+        return (dict, (list(self.items()),))
+
+# Define RecordStore class to persist the record dictionaries of every entity
+class RecordStore:
+    # Storage mode: "snapshot" rewrites the whole file on every change,
+    # "log" appends one entry per changed record and compacts in the background,
+    # "lazy" works like "log" but writes indexed snapshots that are memory-mapped and decoded on access,
+    # "sqlite" keeps one table per entity in an embedded database.
+    # Chosen at startup with the EMS_STORAGE_MODE environment variable (or the --storage option of the GUI).
+    modes = ("snapshot", "log", "lazy", "sqlite")
+    mode = "log"
+    compact_threshold = 1000  # Number of log entries after which the log is compacted
+    database_file = "event_management.db"  # Database used by the "sqlite" mode
+
+    _locks = {}  # One lock per data file to serialize appends, rotation and snapshots
+    _log_sizes = {}  # Number of entries currently in each log file
+    _generations = {}  # Incremented on every full save so stale compactions are discarded
+    _containers = {}  # Factory turning the records of a data file into the container its snapshots are written as
+    _compacting = {}  # Thread of each data file with a background compaction currently running
+    _signatures = {}  # Signature of each data file right after this process last read or wrote it
+    _registry_lock = threading.Lock()  # Guards the dictionaries above
+    _connection = None  # Shared database connection of the "sqlite" mode
+    _database_lock = threading.RLock()  # Serializes access to the shared database connection
+
+    # Class method to choose the storage mode (before any data is loaded)
+    @classmethod
+    def set_mode(cls, mode):
+        if mode not in cls.modes:
+            raise ValueError("Storage mode must be one of {}".format(", ".join(cls.modes)))
+        cls.mode = mode
+
+    # Class method to get the lock of a data file
+    @classmethod
+    def _lock(cls, data_file):
+        with cls._registry_lock:
+            return cls._locks.setdefault(data_file, threading.RLock())
+
+    # Class method to get the path of the change log of a data file
+    @classmethod
+    def log_file(cls, data_file):
+        return data_file + ".log"
+
+    # Class method to get the path of a log that is being folded into the snapshot
+    @classmethod
+    def compacting_file(cls, data_file):
+        return data_file + ".log.compacting"
+
+    # Class method to get a cheap signature of the stored data of a data file
+    @classmethod
+    def signature(cls, data_file):
+        if cls.mode == "sqlite":
+            # data_version only changes when another connection commits to the database
+            with cls._database_lock:
+                return ("sqlite", cls._database(data_file).execute("PRAGMA data_version").fetchone()[0])
+        signature = []
+        for path in (data_file, cls.log_file(data_file), cls.compacting_file(data_file)):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))  # Modification time and size of the file
+            except FileNotFoundError:
+                signature.append(None)  # Missing file
+        return tuple(signature)
+
+    # Class method to check whether a data file was changed by someone else since this process last used it
+    @classmethod
+    def changed_externally(cls, data_file):
+        lock = cls._lock(data_file)
+        if not lock.acquire(blocking=False):
+            return False  # Another thread of this process is writing the file right now
+        try:
+            return cls.signature(data_file) != cls._signatures.get(data_file)
+        finally:
+            lock.release()
+
+    # Class method to remember the signature after one of our own writes,
+    # unless the file had already been changed by someone else before it
+    @classmethod
+    def _remember_write(cls, data_file, external):
+        cls._signatures[data_file] = None if external else cls.signature(data_file)
+
+    # Class method to read the snapshot file of a data file
+    @classmethod
+    def _read_snapshot(cls, data_file):
+        try:
+            with open(data_file, "rb") as file:
+                if file.read(len(INDEXED_MAGIC)) != INDEXED_MAGIC:
+                    file.seek(0)
+                    return pickle.load(file) or {}  # Load records or return an empty dictionary
+        except FileNotFoundError:
+            return {}  # Return an empty dictionary if file does not exist
+        records = LazyRecordMap(data_file)  # Indexed snapshot: only the keys are read
+        return records if cls.mode == "lazy" else dict(records.items())
+
+    # Class method to write records to a file
+    @classmethod
+    def _write_snapshot(cls, path, records):
+        if cls.mode == "lazy":
+            return cls._write_indexed_snapshot(path, records)
+        with open(path, "wb") as file:
+            pickle.dump(records, file)  # Save records to file using pickle
+            file.flush()
+            os.fsync(file.fileno())  # Make sure the snapshot is on disk before it replaces the old one
+
+    # Class method to write records as an indexed snapshot (one pickle per record plus a key index)
+    @classmethod
+    def _write_indexed_snapshot(cls, path, records):
+        keys = list(records)
+        offsets = array("Q")  # Start of every record, followed by the end of the last one
+        with open(path, "wb") as file:
+            file.write(INDEXED_MAGIC)
+            for key in keys:
+                offsets.append(file.tell())
+                # Records that were never decoded are copied byte for byte from the old snapshot
+                data = records.raw(key) if isinstance(records, LazyRecordMap) else None
+                file.write(data if data is not None else pickle.dumps(records[key]))
+            offsets.append(file.tell())
+            index_offset = file.tell()
+            pickle.dump((keys, offsets), file)  # Save the key index using pickle
+            file.write(INDEXED_FOOTER.pack(index_offset))
+            file.flush()
+            os.fsync(file.fileno())  # Make sure the snapshot is on disk before it replaces the old one
+
+    # Class method to apply the entries of a log file to a dictionary of records
+    @classmethod
+    def _replay(cls, log_path, records):
+        count = 0  # Number of entries applied
+        try:
+            with open(log_path, "rb") as file:
+                while True:
+                    good_offset = file.tell()  # End of the last complete entry
+                    try:
+                        entry = pickle.load(file)
+                    except (EOFError, pickle.UnpicklingError):
+                        size = os.fstat(file.fileno()).st_size
+                        if good_offset == size:
+                            break  # End of the log reached
+                        if file.tell() < size:
+                            raise  # A damaged entry with more entries after it: leave the log untouched
+                        # A torn last entry left by an interrupted write: cut it off so later appends stay readable
+                        file.close()
+                        os.truncate(log_path, good_offset)
+                        break
+                    # Any other error (like a record class that cannot be imported) is raised without touching the log
+                    if entry[0] == "put":
+                        records[entry[1]] = entry[2]  # Upsert the record
+                    elif entry[0] == "delete":
+                        records.pop(entry[1], None)  # Remove the record if present
+                    count += 1
+        except FileNotFoundError:
+            pass  # No log means no pending changes
+        return count
+
+    # Class method to load all records of a data file (snapshot plus replayed logs)
+    @classmethod
+    def load(cls, data_file):
+        if cls.mode == "sqlite":
+            return cls._sqlite_load(data_file)
+        with cls._lock(data_file):
+            signature = cls.signature(data_file)  # Taken before reading so concurrent changes are noticed later
+            records = cls._read_snapshot(data_file)
+            # Replay a log left over by an interrupted compaction first, then the current log
+            cls._replay(cls.compacting_file(data_file), records)
+            cls._log_sizes[data_file] = cls._replay(cls.log_file(data_file), records)
+            cls._signatures[data_file] = signature
+            return records
+
+    # Class method to save all records of a data file, replacing any pending log
+    @classmethod
+    def save(cls, data_file, records):
+        if cls.mode == "sqlite":
+            return cls._sqlite_save(data_file, records)
+        with cls._lock(data_file):
+            temp_file = data_file + ".tmp"
+            cls._write_snapshot(temp_file, records)
+            MappedSnapshot.replace(temp_file, data_file)  # Atomically replace the old snapshot
+            # The new snapshot already contains every logged change, so the logs are obsolete
+            for log_path in (cls.log_file(data_file), cls.compacting_file(data_file)):
+                if os.path.exists(log_path):
+                    os.remove(log_path)
+            cls._log_sizes[data_file] = 0
+            cls._generations[data_file] = cls._generations.get(data_file, 0) + 1
+            cls._remember_write(data_file, False)  # The new snapshot is everything there is
+
+    # Class method to append entries to the log of a data file in one durable write
+    @classmethod
+    def _append(cls, data_file, entries):
+        data = b"".join(pickle.dumps(entry) for entry in entries)  # Serialize outside the lock
+        with cls._lock(data_file):
+            external = cls.changed_externally(data_file)
+            with open(cls.log_file(data_file), "ab") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())  # Make the whole group durable at once
+            cls._remember_write(data_file, external)
+            cls._log_sizes[data_file] = cls._log_sizes.get(data_file, 0) + len(entries)
+            if cls._log_sizes[data_file] >= cls.compact_threshold:
+                cls.compact_in_background(data_file)
+
+    # Class method to get a single record, or None if it does not exist
+    @classmethod
+    def get(cls, data_file, key):
+        if cls.mode == "sqlite":
+            return cls._sqlite_get(data_file, key)
+        return cls.load(data_file).get(key)
+
+    # Class method to write a group of ("put", key, record) and ("delete", key) entries at once
+    @classmethod
+    def write_batch(cls, data_file, entries):
+        if not entries:
+            return
+        if cls.mode == "sqlite":
+            cls._sqlite_write_batch(data_file, entries)
+        elif cls.mode in ("log", "lazy"):
+            cls._append(data_file, entries)
+        else:
+            with cls._lock(data_file):
+                records = cls.load(data_file)
+                for entry in entries:
+                    if entry[0] == "put":
+                        records[entry[1]] = entry[2]
+                    else:
+                        records.pop(entry[1], None)
+                cls.save(data_file, records)
+
+    # Class method to insert or replace a single record
+    @classmethod
+    def put(cls, data_file, key, record):
+        cls.write_batch(data_file, [("put", key, record)])
+
+    # Class method to delete a single record
+    @classmethod
+    def delete(cls, data_file, key):
+        cls.write_batch(data_file, [("delete", key)])
+
+    # Class method to choose the container that compacted snapshots of a data file are written as
+    # (the Repository registers the same container it loads the records into)
+    @classmethod
+    def set_container(cls, data_file, factory):
+        cls._containers[data_file] = factory
+
+    # Class method to fold the log of a data file into its snapshot
+    @classmethod
+    def compact(cls, data_file):
+        log_path = cls.log_file(data_file)
+        compacting_path = cls.compacting_file(data_file)
+
+        # Rotate the log so new entries keep being appended while the snapshot is rebuilt
+        with cls._lock(data_file):
+            generation = cls._generations.get(data_file, 0)
+            if os.path.exists(log_path) and not os.path.exists(compacting_path):
+                external = cls.changed_externally(data_file)
+                os.replace(log_path, compacting_path)
+                cls._log_sizes[data_file] = 0
+                cls._remember_write(data_file, external)
+            if not os.path.exists(compacting_path):
+                return
+
+        # Rebuild the snapshot outside the lock so appends are never blocked
+        records = cls._read_snapshot(data_file)
+        cls._replay(compacting_path, records)
+        factory = cls._containers.get(data_file)
+        if factory is not None and type(records) is dict:
+            records = factory(records)  # Written as the container the records are loaded into, like a full save
+        temp_file = data_file + ".compact.tmp"
+        cls._write_snapshot(temp_file, records)
+
+        # Install the new snapshot unless a full save replaced everything in the meantime
+        with cls._lock(data_file):
+            if generation == cls._generations.get(data_file, 0) and os.path.exists(compacting_path):
+                external = cls.changed_externally(data_file)
+                MappedSnapshot.replace(temp_file, data_file)
+                os.remove(compacting_path)
+                cls._remember_write(data_file, external)
+            else:
+                os.remove(temp_file)
+
+    # Class method to compact the log of a data file on a background thread
+    @classmethod
+    def compact_in_background(cls, data_file):
+        with cls._registry_lock:
+            if data_file in cls._compacting:
+                return  # A compaction is already running for this file
+
+            def run():
+                try:
+                    cls.compact(data_file)
+                except Exception as e:
+                    print(f"Error compacting {data_file}: {e}")  # Print error message if compaction fails
+                finally:
+                    with cls._registry_lock:
+                        cls._compacting.pop(data_file, None)
+
+            thread = cls._compacting[data_file] = threading.Thread(target=run, daemon=True)
+        thread.start()
+
+    # Class method to wait until the background compactions running now have finished
+    @classmethod
+    def wait_for_compactions(cls):
+        with cls._registry_lock:
+            threads = list(cls._compacting.values())
+        for thread in threads:
+            thread.join()
+
+
+    # Class method to get the table name of a data file ("clients.pkl" is stored in table "clients")
+    @classmethod
+    def table_name(cls, data_file):
+        return os.path.splitext(os.path.basename(data_file))[0]
+
+    # Class method to open the shared database connection and create the table of a data file
+    @classmethod
+    def _database(cls, data_file):
+        if cls._connection is None:
+            cls._connection = sqlite3.connect(cls.database_file, check_same_thread=False)
+        # One table per entity, keyed by the record ID (the primary key is indexed by SQLite)
+        cls._connection.execute(
+            'CREATE TABLE IF NOT EXISTS "{}" (id TEXT PRIMARY KEY, record BLOB NOT NULL)'.format(cls.table_name(data_file)))
+        return cls._connection
+
+    # Class method to load all records of a table in insertion order
+    @classmethod
+    def _sqlite_load(cls, data_file):
+        with cls._database_lock:
+            cls._signatures[data_file] = cls.signature(data_file)
+            rows = cls._database(data_file).execute(
+                'SELECT id, record FROM "{}" ORDER BY rowid'.format(cls.table_name(data_file)))
+            return {key: pickle.loads(record) for key, record in rows}
+
+    # Class method to replace all records of a table in one transaction
+    @classmethod
+    def _sqlite_save(cls, data_file, records):
+        with cls._database_lock:
+            connection = cls._database(data_file)
+            with connection:
+                connection.execute('DELETE FROM "{}"'.format(cls.table_name(data_file)))
+                connection.executemany(
+                    'INSERT INTO "{}" (id, record) VALUES (?, ?)'.format(cls.table_name(data_file)),
+                    ((key, pickle.dumps(record)) for key, record in records.items()))
+
+    # Class method to read one row of a table
+    @classmethod
+    def _sqlite_get(cls, data_file, key):
+        with cls._database_lock:
+            row = cls._database(data_file).execute(
+                'SELECT record FROM "{}" WHERE id = ?'.format(cls.table_name(data_file)), (key,)).fetchone()
+            return pickle.loads(row[0]) if row else None
+
+    # Class method to insert, update and delete rows of a table in one transaction
+    @classmethod
+    def _sqlite_write_batch(cls, data_file, entries):
+        table = cls.table_name(data_file)
+        with cls._database_lock:
+            connection = cls._database(data_file)
+            with connection:  # One transaction for the whole group
+                for entry in entries:
+                    if entry[0] == "put":
+                        connection.execute(
+                            'INSERT INTO "{}" (id, record) VALUES (?, ?) '
+                            'ON CONFLICT(id) DO UPDATE SET record = excluded.record'.format(table),
+                            (entry[1], pickle.dumps(entry[2])))
+                    else:
+                        connection.execute('DELETE FROM "{}" WHERE id = ?'.format(table), (entry[1],))
+
+    # Class method to copy existing pickle files (snapshot plus log) into the database
+    @classmethod
+    def migrate_to_sqlite(cls, data_files):
+        counts = {}  # Number of records migrated per data file
+        for data_file in data_files:
+            with cls._lock(data_file):
+                records = cls._read_snapshot(data_file)
+                cls._replay(cls.compacting_file(data_file), records)
+                cls._replay(cls.log_file(data_file), records)
+            cls._sqlite_save(data_file, records)
+            counts[data_file] = len(records)
+        return counts
+
+
+# Use the storage mode chosen in the environment, if any
+RecordStore.set_mode(os.environ.get("EMS_STORAGE_MODE", RecordStore.mode))
+
+
+# In[ ]:
+
+
+
+
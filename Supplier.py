@@ -8,9 +8,16 @@
 import pickle  # Import the pickle module for object serialization
 from enum import Enum  # Import Enum class for creating enumerated constants
 
+from Record import SlottedRecord  # Import SlottedRecord for compact instances
+from Repository import Repository  # Import Repository for the shared in-memory records
+from Search import GlobalSearch, PrefixIndex, TextIndex  # Import the search indexes
+
 # Define Supplier class to represent a supplier instance
-class Supplier:
+class Supplier(SlottedRecord):
     data_file = "suppliers.pkl"  # File to store supplier data
+    __slots__ = ("supplier_id", "name", "address", "contact_details")  # Attributes stored without a per-instance __dict__
+    search_index = PrefixIndex("name")  # Prefix index over supplier IDs and names, kept current by the Repository
+    text_index = TextIndex(("name", "address", "contact_details"))  # Words of the suppliers for the global search
 
     # Initialize supplier attributes with input validation
     def __init__(self, supplier_id, name, address, contact_details):
@@ -48,17 +55,39 @@ class Supplier:
     # Class method to load suppliers from file
     @classmethod
     def load_suppliers(cls):
-        try:
-            with open(cls.data_file, "rb") as file:
-                return pickle.load(file)  # Load suppliers from file using pickle
-        except FileNotFoundError:
-            return {}  # Return an empty dictionary if file does not exist
+        return Repository.load(cls.data_file)  # Load suppliers once and share them across the application
 
     # Class method to save suppliers to file
     @classmethod
     def save_suppliers(cls, suppliers):
-        with open(cls.data_file, "wb") as file:
-            pickle.dump(suppliers, file)  # Save suppliers to file using pickle
+        Repository.save(cls.data_file, suppliers)  # Save all suppliers to file using pickle
+
+    # Class method to get a single supplier by ID, or None if it does not exist
+    @classmethod
+    def get_supplier(cls, supplier_id):
+        return Repository.get(cls.data_file, supplier_id)  # Read only the requested supplier when the backend allows it
+
+    # Class method to save a single supplier without rewriting the whole file
+    @classmethod
+    def put_supplier(cls, supplier):
+        Repository.put(cls.data_file, supplier.supplier_id, supplier)  # Store the supplier (written in the background in the storage mode in use)
+
+    # Class method to delete a single supplier without rewriting the whole file
+    @classmethod
+    def delete_supplier(cls, supplier_id):
+        Repository.delete(cls.data_file, supplier_id)  # Delete it from storage (written in the background in the storage mode in use)
+
+    # Class method to find the IDs of the suppliers whose ID or name starts with a prefix (ignoring case)
+    @classmethod
+    def search_suppliers(cls, prefix):
+        cls.load_suppliers()  # Make sure the suppliers (and therefore the index) are current
+        return cls.search_index.search(prefix)
+
+
+# Keep the search index current through every load, save, put and delete of suppliers
+Repository.add_index(Supplier.data_file, Supplier.search_index)
+# Include the suppliers in the global search
+GlobalSearch.register(Supplier)
 
 
 # In[ ]:
@@ -7,9 +7,53 @@
 
 import pickle  # Import the pickle module for object serialization
 from enum import Enum  # Import Enum class for creating enumerated constants
+
+from Record import SlottedRecord  # Import SlottedRecord for compact instances
+from Repository import Repository, RecordIndex  # Import Repository for the shared in-memory records
+from Search import GlobalSearch, PrefixIndex, TextIndex  # Import the search indexes
+
+# Define VenueAddressIndex class to look venues up by address without scanning them all
+class VenueAddressIndex(RecordIndex):
+    def __init__(self):
+        self.exact = {}  # Address -> venue IDs with exactly that address (in insertion order)
+        self.normalized = {}  # Normalized address -> venue IDs
+
+    # Normalize an address for matching that ignores case and repeated whitespace
+    def normalize(self, address):
+        return " ".join(address.split()).casefold()
+
+    # Rebuild the index from all venues
+    def rebuild(self, venues):
+        self.exact = {}
+        self.normalized = {}
+        for venue_id, venue in venues.items():
+            self.add(venue_id, venue)
+
+    # Add one venue to the index
+    def add(self, venue_id, venue):
+        self.exact.setdefault(venue.address, {})[venue_id] = None
+        self.normalized.setdefault(self.normalize(venue.address), {})[venue_id] = None
+
+    # Remove one venue from the index
+    def remove(self, venue_id, venue):
+        for index, address in ((self.exact, venue.address), (self.normalized, self.normalize(venue.address))):
+            venue_ids = index.get(address, {})
+            venue_ids.pop(venue_id, None)
+            if not venue_ids:
+                index.pop(address, None)  # Drop addresses without venues
+
+    # Get the ID of the venue at an address (exact match first, then normalized), or None
+    def lookup(self, address):
+        venue_ids = self.exact.get(address) or self.normalized.get(self.normalize(address))
+        return next(iter(venue_ids)) if venue_ids else None
+
 # Define Venue class to represent a venue instance
-class Venue:
+class Venue(SlottedRecord):
     data_file = "venues.pkl"  # File to store venue data
+    __slots__ = ("venue_id", "name", "address", "contact", "min_guests", "max_guests")  # Attributes stored without a per-instance __dict__
+    search_index = PrefixIndex("name")  # Prefix index over venue IDs and names, kept current by the Repository
+    text_index = TextIndex(("name", "address", "contact"))  # Words of the venues for the global search
+    address_index = VenueAddressIndex()  # Address index kept current by the Repository
 
     # Initialize venue attributes with input validation
     def __init__(self, venue_id, name, address, contact, min_guests, max_guests):
@@ -59,18 +103,50 @@ class Venue:
     # Class method to load venues from file
     @classmethod
     def load_venues(cls):
-        try:
-            with open(cls.data_file, "rb") as file:
-                return pickle.load(file)  # Load venues from file using pickle
-        except FileNotFoundError:
-            return {}  # Return an empty dictionary if file does not exist
+        return Repository.load(cls.data_file)  # Load venues once and share them across the application
+
+    # Class method to find a venue by address (ignoring case and extra whitespace), or None
+    @classmethod
+    def find_by_address(cls, address):
+        if not isinstance(address, str):
+            return None
+        venues = cls.load_venues()  # Make sure the venues (and therefore the index) are current
+        venue_id = cls.address_index.lookup(address)
+        return venues.get(venue_id) if venue_id is not None else None
 
     # Class method to save venues to file
     @classmethod
     def save_venues(cls, venues):
-        with open(cls.data_file, "wb") as file:
-            pickle.dump(venues, file)  # Save venues to file using pickle
-            
+        Repository.save(cls.data_file, venues)  # Save all venues to file using pickle
+
+    # Class method to get a single venue by ID, or None if it does not exist
+    @classmethod
+    def get_venue(cls, venue_id):
+        return Repository.get(cls.data_file, venue_id)  # Read only the requested venue when the backend allows it
+
+    # Class method to save a single venue without rewriting the whole file
+    @classmethod
+    def put_venue(cls, venue):
+        Repository.put(cls.data_file, venue.venue_id, venue)  # Store the venue (written in the background in the storage mode in use)
+
+    # Class method to delete a single venue without rewriting the whole file
+    @classmethod
+    def delete_venue(cls, venue_id):
+        Repository.delete(cls.data_file, venue_id)  # Delete it from storage (written in the background in the storage mode in use)
+
+    # Class method to find the IDs of the venues whose ID or name starts with a prefix (ignoring case)
+    @classmethod
+    def search_venues(cls, prefix):
+        cls.load_venues()  # Make sure the venues (and therefore the index) are current
+        return cls.search_index.search(prefix)
+
+
+# Keep the address index current through every load, save, put and delete of venues
+Repository.add_index(Venue.data_file, Venue.address_index)
+# Keep the search index current through every load, save, put and delete of venues
+Repository.add_index(Venue.data_file, Venue.search_index)
+# Include the venues in the global search
+GlobalSearch.register(Venue)
 
 
 # In[ ]:
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# In[ ]:
+
+
+import tkinter as tk  # Import the tkinter library and alias it as tk for easier access
+from tkinter import ttk  # Import themed widgets from tkinter
+
+# Define VirtualTreeview class: a Treeview that only holds the rows currently in view.
+# The rows are given as a list of keys; row_values(key) returns the (text, values) of one row and is
+# only called for visible rows. Item IDs are the keys. selection() keeps returning the key of the selected
+# row after it is scrolled out of view, but that row is then not in the widget, so item() can only be used
+# for visible rows.
+class VirtualTreeview(ttk.Treeview):
+    header_height = 24  # Approximate height of the column headings in pixels
+
+    def __init__(self, master, row_values, **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_values = row_values  # Function returning (text, values) for a key
+        self.keys = []  # Keys of all rows, in display order
+        self.key_set = set()  # The same keys, for fast membership tests
+        self.first = 0  # Index of the first visible row
+        self.selected_key = None  # Key of the selected row, kept while it is scrolled out of view
+        self.scrollbar = None  # Scrollbar attached with attach_scrollbar
+
+        # Scroll with the mouse wheel (Windows/macOS and X11) and the keyboard, and re-render on resize
+        self.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1) or "break")
+        self.bind("<Button-4>", lambda event: self.scroll(-1) or "break")
+        self.bind("<Button-5>", lambda event: self.scroll(1) or "break")
+        self.bind("<Up>", lambda event: self.move_selection(-1) or "break")
+        self.bind("<Down>", lambda event: self.move_selection(1) or "break")
+        self.bind("<Prior>", lambda event: self.scroll(-self.visible_rows()) or "break")
+        self.bind("<Next>", lambda event: self.scroll(self.visible_rows()) or "break")
+        self.bind("<Configure>", lambda event: self.render())
+        self.bind("<<TreeviewSelect>>", self.on_select, add="+")
+
+    # Attach a vertical scrollbar that scrolls through all rows, not only the visible ones
+    def attach_scrollbar(self, scrollbar):
+        self.scrollbar = scrollbar
+        scrollbar.configure(command=self.on_scrollbar)
+
+    # Number of rows that fit in the widget
+    def visible_rows(self):
+        row_height = ttk.Style(self).lookup("Treeview", "rowheight") or 20
+        height = self.winfo_height()
+        if height <= 1:  # Not drawn yet: use the requested height in rows
+            return int(self.cget("height"))
+        return max(1, (height - self.header_height) // int(row_height))
+
+    # Replace all rows (only the visible ones are inserted into the widget)
+    def set_rows(self, keys):
+        self.keys = list(keys)
+        self.key_set = set(self.keys)
+        self.render()
+
+    # Add, update or remove the row of one key (present tells whether the record still exists)
+    def sync_row(self, key, present):
+        if present and key not in self.key_set:
+            self.keys.append(key)
+            self.key_set.add(key)
+        elif not present and key in self.key_set:
+            self.keys.remove(key)
+            self.key_set.discard(key)
+        self.render()  # Only the visible rows are re-inserted, with their current values
+
+    # Scroll by a number of rows
+    def scroll(self, rows):
+        self.first += rows
+        self.render()
+
+    # Move the selection up or down, scrolling when it leaves the view
+    def move_selection(self, step):
+        if not self.keys:
+            return
+        try:
+            index = self.keys.index(self.selected_key, max(0, self.first - 1)) + step
+        except ValueError:
+            index = self.first
+        index = min(max(index, 0), len(self.keys) - 1)
+        self.selected_key = self.keys[index]
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + self.visible_rows():
+            self.first = index - self.visible_rows() + 1
+        self.render()
+
+    # Handle the scrollbar commands ("moveto", fraction) and ("scroll", count, "units" or "pages")
+    def on_scrollbar(self, command, amount, unit=None):
+        if command == "moveto":
+            self.first = int(float(amount) * len(self.keys))
+        elif unit == "pages":
+            self.first += int(amount) * self.visible_rows()
+        else:
+            self.first += int(amount)
+        self.render()
+
+    # Get the keys of the selected rows, including a selected row that is scrolled out of view
+    def selection(self):
+        selection = super().selection()
+        if not selection and self.selected_key in self.key_set:
+            return (self.selected_key,)
+        return selection
+
+    # Remember the selected key so the selection survives scrolling
+    def on_select(self, event=None):
+        selection = super().selection()
+        if selection:
+            self.selected_key = selection[0]  # Item IDs are the row keys
+
+    # Insert the rows of the current view into the widget
+    def render(self):
+        visible = self.visible_rows()
+        self.first = max(0, min(self.first, len(self.keys) - visible))
+        window = self.keys[self.first:self.first + visible]
+
+        self.delete(*self.get_children())
+        for key in window:
+            text, values = self.row_values(key)
+            self.insert("", "end", iid=key, text=text, values=values)
+        if self.selected_key in window:
+            self.selection_set(self.selected_key)
+            self.focus(self.selected_key)
+
+        if self.scrollbar is not None:
+            total = max(len(self.keys), 1)
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+
+
+# In[ ]:
+
+
+
+